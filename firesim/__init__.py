@@ -0,0 +1,11 @@
+"""Motor de la simulación distribuida de incendios forestales.
+
+Los kernels y la generación de terreno solo dependen de NumPy; MPI, Tk y
+psutil se cargan al ejecutar ``run()``.
+"""
+
+
+def run(argv=None):
+    """Ejecutar la simulación (ver firesim.simulation.run)"""
+    from .simulation import run as run_simulation
+    return run_simulation(argv)
@@ -0,0 +1,5 @@
+from . import run
+
+# Protegido: los procesos spawn de la exportación de frames reimportan este módulo
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,136 @@
+import heapq
+import logging
+import time
+
+import numpy as np
+from mpi4py import MPI
+
+from .config import ROWS, COLS, PROB_BASE, NEIGHBOR_DIRECTIONS, default_fire_params
+from .engine import climate_factor, direction_factor
+from .exchange import RegionExchange
+
+logger = logging.getLogger(__name__)
+
+
+def arrival_cost_planes(model, padded_state, padded_elevation, climate, burning_state, params, wind=None):
+    """Pasos esperados para que el fuego llegue a cada celda desde el vecino de cada dirección
+
+    Usa los mismos factores que step_window: con probabilidad p por paso la espera
+    media es 1/p, e infinita si la celda no tiene combustible.
+    """
+    height, width = climate.shape
+    interior = (slice(1, height + 1), slice(1, width + 1))
+    target = model.fuel_lut[model.index(padded_state[interior])] * climate * (params['prob_base'] / PROB_BASE)
+    source = model.spread_lut[model.index(burning_state)]
+    cell_elevation = padded_elevation[interior]
+
+    costs = []
+    for k, (dx, dy) in enumerate(NEIGHBOR_DIRECTIONS):
+        neighbor = (slice(1 + dx, 1 + dx + height), slice(1 + dy, 1 + dy + width))
+        factor = direction_factor(k, cell_elevation, padded_elevation[neighbor], params, wind)
+        prob = np.minimum(source[neighbor] * factor * target, model.max_ignition)
+        with np.errstate(divide='ignore'):
+            costs.append((1.0 / prob).tolist())
+    return costs
+
+
+def relax_region(times, costs, seeds):
+    """Dijkstra desde las celdas semilla sobre la región ampliada; solo cambia el interior"""
+    height, width = len(times) - 2, len(times[0]) - 2
+    heap = [(times[i][j], i, j) for i, j in seeds]
+    heapq.heapify(heap)
+    updated = 0
+    while heap:
+        t, i, j = heapq.heappop(heap)
+        if t > times[i][j]:
+            continue
+        for k, (dx, dy) in enumerate(NEIGHBOR_DIRECTIONS):
+            # La celda (i, j) es el vecino en (dx, dy) de la celda que se relaja
+            vi, vj = i - dx, j - dy
+            if 0 < vi <= height and 0 < vj <= width:
+                candidate = t + costs[k][vi - 1][vj - 1]
+                if candidate < times[vi][vj]:
+                    times[vi][vj] = candidate
+                    heapq.heappush(heap, (candidate, vi, vj))
+                    updated += 1
+    return updated
+
+
+def solve_arrival_times(exchange, forest, model, params=None, wind=None):
+    """Tiempo de llegada del fuego (en pasos) a cada celda de la región local
+
+    ``wind`` son los factores de viento por dirección de la región (ver firesim.wind).
+    Cada proceso resuelve su región y luego intercambia con los vecinos los tiempos
+    del borde; las celdas fantasma que mejoran siembran la siguiente ronda, hasta que
+    ningún proceso cambia.
+    """
+    if params is None:
+        params = default_fire_params()
+    comm = exchange.comm
+    rows, cols = forest.shape
+    padded_state = exchange.update(forest).copy()
+    interior = (slice(1, rows + 1), slice(1, cols + 1))
+
+    # Estado con el que arderá cada celda: el actual si ya arde, si no el de ignición
+    burning_state = np.where(model.is_fire(padded_state), padded_state,
+                             model.ignition_states(exchange.owner_state, exchange.padded_humidity,
+                                                   exchange.padded_temperature))
+    climate = climate_factor(exchange.padded_humidity[interior], exchange.padded_temperature[interior], params)
+    costs = arrival_cost_planes(model, padded_state, exchange.padded_elevation, climate, burning_state, params,
+                                wind)
+
+    times = np.full(padded_state.shape, np.inf)
+    times[interior][model.is_fire(forest)] = 0.0
+    seeds = [(int(i), int(j)) for i, j in np.argwhere(times == 0.0)]
+    times = times.tolist()
+
+    rounds = 0
+    while True:
+        relax_region(times, costs, seeds)
+        rounds += 1
+        current = np.array(times)
+        ghosts = exchange.pad_field(current[interior], np.inf)
+        improved = np.argwhere(ghosts < current)
+        for i, j in improved:
+            times[i][j] = float(ghosts[i, j])
+        seeds = [(int(i), int(j)) for i, j in improved]
+        if not comm.allreduce(len(seeds) > 0, op=MPI.LOR):
+            break
+
+    logger.info(f"Tiempos de llegada resueltos en {rounds} rondas")
+    return np.array(times)[interior], rounds
+
+
+def run_arrival(sim, path):
+    """Calcular el ráster de tiempos de llegada y guardarlo en el rank 0"""
+    rank = sim.rank
+    start = time.time()
+    # Los tiempos suponen fijos el viento y los parámetros del paso 0
+    sim.apply_events(0)
+    wind = None
+    if sim.wind is not None:
+        sim.wind.update(0, sim.params)
+        wind = sim.wind.planes(sim.bounds)
+    exchange = RegionExchange(sim.comm, rank, sim.size, sim.forest, sim.elevation, depth=1,
+                              humidity=sim.humidity, temperature=sim.temperature)
+    arrival, rounds = solve_arrival_times(exchange, sim.forest, sim.model, sim.params, wind)
+    elapsed = time.time() - start
+    print(f"[Rank {rank}] Tiempos de llegada: {rounds} rondas, {elapsed:.3f}s")
+
+    regions = sim.comm.gather({'arrival': arrival, 'bounds': sim.bounds}, root=0)
+    if rank != 0:
+        return None
+
+    raster = np.full((ROWS, COLS), np.inf)
+    for region in regions:
+        r0, r1, c0, c1 = region['bounds']
+        raster[r0:r1, c0:c1] = region['arrival']
+    np.save(path, raster)
+
+    reached = raster[np.isfinite(raster)]
+    print(f"TIEMPOS DE LLEGADA: {reached.size} de {raster.size} celdas alcanzables en {elapsed:.3f}s")
+    if reached.size:
+        p50, p90 = np.percentile(reached, [50, 90])
+        print(f"   Paso esperado: P50 {p50:.1f} | P90 {p90:.1f} | máximo {reached.max():.1f}")
+    print(f"   Ráster: {path}")
+    return raster
@@ -0,0 +1,120 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from .compressed import CompressedRegion
+from .config import default_fire_params
+from .engine import build_fire_model
+from .hostinfo import peak_rss_mb
+from .kernels import StateBuffers, spread_process_fire
+from .terrain import generate_terrain, initialize_process_fires
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Medir el kernel de propagación en un solo proceso (sin MPI)")
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--cols', type=int, default=1000)
+    parser.add_argument('--steps', type=int, default=50)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--model', choices=['procesos', 'intensidad'], default='procesos')
+    parser.add_argument('--seed', type=int, default=12345)
+    parser.add_argument('--terrain', choices=['ruido', 'aleatorio'], default='ruido')
+    parser.add_argument('--no-buffers', action='store_true',
+                        help="Reservar estado y auxiliares nuevos en cada paso (comportamiento anterior)")
+    parser.add_argument('--compressed', action='store_true',
+                        help="Región por bloques: solo se expanden los bloques cercanos al fuego")
+    parser.add_argument('--block-size', type=int, default=32)
+    parser.add_argument('--block-rows', type=int, default=None,
+                        help="Filas por tramo del recorrido por bloques de caché (0: sin tramos; "
+                             "por defecto según el ancho)")
+    parser.add_argument('--compare-blocking', default=None, metavar='LADOS',
+                        help="Comparar con y sin tramos en regiones cuadradas de estos lados, p. ej. 500,1000,2000")
+    return parser.parse_args(argv)
+
+
+def run_compressed_benchmark(args):
+    """Como run_benchmark pero con la región comprimida por bloques"""
+    random.seed(args.seed)
+    model = build_fire_model(args.model, 1)
+    region = CompressedRegion((0, args.rows, 0, args.cols), args.seed, model, 0, block_size=args.block_size)
+    region.initialize_fires(model.initial_fire_states)
+
+    start = time.perf_counter()
+    for step in range(args.steps):
+        region.step(step)
+    elapsed = time.perf_counter() - start
+
+    total_blocks = len(region.block_keys())
+    print(f"Región {args.rows}x{args.cols}, {args.steps} pasos, bloques de {args.block_size}, comprimida")
+    print(f"  Tiempo por paso: {elapsed / args.steps * 1000:.2f} ms")
+    print(f"  Bloques: {len(region.dense)} densos, {len(region.static)} estáticos, "
+          f"{len(region.uniform)} uniformes de {total_blocks}")
+    print(f"  Memoria de bloques: {region.nbytes() / (1024 * 1024):.1f} MB "
+          f"(densa equivalente: {args.rows * args.cols * 8 * 6 / (1024 * 1024):.1f} MB)")
+    rss = peak_rss_mb()
+    if rss is not None:
+        print(f"  Pico de RSS: {rss:.1f} MB")
+    return elapsed / args.steps, rss
+
+
+def run_benchmark(args):
+    """Tiempo por paso y pico de memoria del kernel sobre una región de rows x cols"""
+    if args.compressed:
+        return run_compressed_benchmark(args)
+    np.random.seed(args.seed)
+    forest, elevation, humidity, temperature = generate_terrain(args.terrain, args.seed, 0, args.rows, 0, args.cols)
+    model = build_fire_model(args.model, 1)
+    forest = initialize_process_fires(forest, 0, model.initial_fire_states)
+    params = default_fire_params()
+
+    buffers = None
+    if not args.no_buffers:
+        buffers = StateBuffers(forest, elevation, humidity, temperature, args.threads,
+                               block_rows=args.block_rows)
+
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    for step in range(args.steps):
+        forest = spread_process_fire(forest, elevation, humidity, temperature, 0, step, params,
+                                     args.threads, buffers, model)
+    elapsed = time.perf_counter() - start
+
+    mode = "sin búferes" if buffers is None else f"doble búfer, tramos de {buffers.block_rows} filas"
+    print(f"Región {args.rows}x{args.cols}, {args.steps} pasos, {args.threads} hilos, {mode}")
+    print(f"  Tiempo por paso: {elapsed / args.steps * 1000:.2f} ms")
+    if buffers is not None:
+        print(f"  Búferes y auxiliares: {buffers.nbytes() / (1024 * 1024):.1f} MB")
+    rss = peak_rss_mb()
+    if rss is None:
+        print("  Pico de RSS: no disponible en esta plataforma")
+    else:
+        print(f"  Pico de RSS: {rss:.1f} MB (antes de los pasos: {rss_before:.1f} MB)")
+    return elapsed / args.steps, rss
+
+
+def compare_blocking(args):
+    """Tiempo por paso con y sin tramos de caché para cada lado de región pedido"""
+    results = []
+    for side in [int(value) for value in args.compare_blocking.split(',')]:
+        times = {}
+        for block_rows in (0, args.block_rows):
+            case = argparse.Namespace(**vars(args))
+            case.rows = case.cols = side
+            case.block_rows = block_rows
+            times[block_rows], _ = run_benchmark(case)
+        results.append((side, times[0], times[args.block_rows]))
+
+    print("\n  Lado   Sin tramos   Con tramos   Mejora")
+    for side, plain, blocked in results:
+        print(f"  {side:>5} {plain * 1000:9.2f} ms {blocked * 1000:9.2f} ms   {plain / blocked:5.2f}x")
+    return results
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    if arguments.compare_blocking:
+        compare_blocking(arguments)
+    else:
+        run_benchmark(arguments)
@@ -0,0 +1,116 @@
+import argparse
+
+from .config import STEPS, WIND_DIRECTION, WIND_SPEED, PROB_BASE, HUMIDITY_BASE, ELEVATION_FACTOR
+
+
+def parse_arguments(argv=None):
+    """Leer opciones de línea de comandos de la simulación"""
+    parser = argparse.ArgumentParser(description="Simulación distribuida de incendios forestales", allow_abbrev=False)
+    parser.add_argument('--ensemble', type=int, default=0, metavar='N',
+                        help="Ejecutar N realizaciones Monte Carlo en lugar de la simulación interactiva")
+    parser.add_argument('--group-size', type=int, default=1, metavar='G',
+                        help="Procesos por realización en modo ensemble")
+    parser.add_argument('--seed', type=int, default=12345,
+                        help="Semilla base para terreno y realizaciones")
+    parser.add_argument('--steps', type=int, default=STEPS,
+                        help="Pasos por realización")
+    parser.add_argument('--output', default='ensemble',
+                        help="Prefijo de los archivos de resultados del ensemble")
+    parser.add_argument('--terrain', choices=['ruido', 'aleatorio'], default='ruido',
+                        help="Generador de terreno: ruido correlacionado a partir de --seed (continuo entre "
+                             "procesos) o valores independientes por celda")
+    parser.add_argument('--metrics', default=None, metavar='ARCHIVO',
+                        help="Archivo de métricas escrito por el rank 0 (pasos/s, fuegos, tiempos por proceso)")
+    parser.add_argument('--metrics-format', choices=['jsonl', 'prometheus'], default='jsonl',
+                        help="jsonl agrega una línea por reporte; prometheus reescribe el archivo en formato de texto")
+    parser.add_argument('--metrics-every', type=int, default=10, metavar='N',
+                        help="Pasos entre reportes de métricas")
+    parser.add_argument('--headless', action='store_true',
+                        help="El rank 0 simula --steps pasos sin interfaz gráfica")
+    parser.add_argument('--log-sample', type=int, default=1, metavar='N',
+                        help="Registrar en el log los mensajes por paso solo cada N pasos")
+    parser.add_argument('--merge-logs', nargs='?', const='mpi_log_merged.log', default=None, metavar='ARCHIVO',
+                        help="Al terminar, combinar los logs de todos los procesos en un archivo ordenado por tiempo")
+    parser.add_argument('--events', default=None, metavar='ARCHIVO',
+                        help="Eventos programados (JSON-lines): igniciones, cortafuegos, agua y cambios de "
+                             "viento o parámetros en pasos concretos")
+    parser.add_argument('--wind', default=None, metavar='ARCHIVO',
+                        help="Viento variable (JSON-lines por paso): uniforme con direction/speed o un campo "
+                             "grueso de componentes dr/dc interpolado a la malla")
+    parser.add_argument('--record', default=None, metavar='ARCHIVO',
+                        help="Grabar los frames globales para verlos después con python -m firesim.replay")
+    parser.add_argument('--record-every', type=int, default=1, metavar='N',
+                        help="Con --record: grabar un frame cada N pasos")
+    parser.add_argument('--export-frames', default=None, metavar='DIR',
+                        help="Escribir imágenes de los frames globales en DIR (sin Tk)")
+    parser.add_argument('--export-every', type=int, default=10, metavar='N',
+                        help="Con --export-frames: una imagen cada N pasos")
+    parser.add_argument('--export-format', choices=['png', 'ppm'], default='png')
+    parser.add_argument('--export-scale', type=int, default=1, metavar='S',
+                        help="Con --export-frames: píxeles por celda")
+    parser.add_argument('--export-tile', type=int, default=0, metavar='T',
+                        help="Con --export-frames: dividir las imágenes en mosaicos de T x T celdas")
+    parser.add_argument('--export-workers', type=int, default=2,
+                        help="Procesos que codifican y escriben las imágenes")
+    parser.add_argument('--stream', default=None, metavar='DIRECCIÓN',
+                        help="Transmitir los frames por un socket local (tcp:host:puerto o unix:/ruta) "
+                             "para python -m firesim.stream")
+    parser.add_argument('--stream-every', type=int, default=1, metavar='N',
+                        help="Con --stream: publicar un frame cada N pasos")
+    parser.add_argument('--watchdog', action='store_true',
+                        help="Latidos de cada proceso al rank 0 para detectar procesos rezagados o colgados")
+    parser.add_argument('--straggler-steps', type=int, default=5, metavar='N',
+                        help="Con --watchdog: pasos recientes que se promedian para comparar la duración "
+                             "del paso de cada proceso")
+    parser.add_argument('--straggler-factor', type=float, default=2.0, metavar='F',
+                        help="Con --watchdog: rezagado si su paso tarda F veces la mediana de los demás")
+    parser.add_argument('--straggler-seconds', type=float, default=30.0, metavar='S',
+                        help="Con --watchdog: segundos sin latido de un proceso atrasado")
+    parser.add_argument('--abort-stragglers', action='store_true',
+                        help="Con --watchdog: guardar el último estado y abortar si hay procesos rezagados")
+    parser.add_argument('--checkpoint', default='checkpoint.npz', metavar='ARCHIVO',
+                        help="Archivo del estado global guardado al abortar")
+    parser.add_argument('--terrain-cache', default=None, metavar='DIR',
+                        help="Directorio de caché del terreno por ruido (clave: semilla y parámetros)")
+    parser.add_argument('--terrain-cache-mb', type=int, default=1024,
+                        help="Tamaño máximo de la caché de terreno; se desalojan las entradas menos usadas")
+    parser.add_argument('--model', choices=['procesos', 'intensidad'], default='procesos',
+                        help="Modelo de fuego: un fuego por proceso o tres intensidades")
+    parser.add_argument('--threads', type=int, default=1,
+                        help="Hilos por proceso: la región se reparte en bloques horizontales")
+    parser.add_argument('--halo', action='store_true',
+                        help="Intercambiar celdas fantasma para que el fuego cruce entre regiones")
+    parser.add_argument('--halo-depth', type=int, default=0, metavar='K',
+                        help="Con --halo: intercambiar un halo de K celdas cada K pasos y recalcular "
+                             "localmente la franja fantasma (bloqueo temporal)")
+    parser.add_argument('--shared-memory', action='store_true',
+                        help="Compartir regiones entre procesos del mismo nodo mediante ventanas MPI")
+    parser.add_argument('--compressed', action='store_true',
+                        help="Guardar la región por bloques y expandir solo los cercanos al fuego; "
+                             "siempre usa el terreno por ruido y no admite --halo")
+    parser.add_argument('--block-size', type=int, default=32, metavar='B',
+                        help="Con --compressed: lado de los bloques en celdas")
+    parser.add_argument('--arrival', action='store_true',
+                        help="Calcular el tiempo esperado de llegada del fuego a cada celda en lugar de simular paso a paso")
+    parser.add_argument('--raster', default='arrival_time.npy',
+                        help="Con --arrival: archivo .npy del ráster de tiempos de llegada")
+    parser.add_argument('--sweep', action='store_true',
+                        help="Barrido de parámetros con distribución dinámica de tareas")
+    parser.add_argument('--wind-directions', default=WIND_DIRECTION,
+                        help="Direcciones de viento del barrido, separadas por comas")
+    parser.add_argument('--wind-speeds', default=str(WIND_SPEED),
+                        help="Velocidades de viento del barrido")
+    parser.add_argument('--prob-bases', default=str(PROB_BASE),
+                        help="Valores de PROB_BASE del barrido")
+    parser.add_argument('--humidity-bases', default=str(HUMIDITY_BASE),
+                        help="Humedades base del barrido")
+    parser.add_argument('--elevation-factors', default=str(ELEVATION_FACTOR),
+                        help="Valores de ELEVATION_FACTOR del barrido")
+    parser.add_argument('--results', default='sweep_results.jsonl',
+                        help="Archivo JSON-lines con los resultados del barrido")
+    args = parser.parse_args(argv)
+    if args.compressed and (args.halo or args.shared_memory):
+        parser.error("--compressed no se puede combinar con --halo ni --shared-memory")
+    if args.compressed and args.arrival:
+        parser.error("--arrival necesita el terreno denso: no se puede combinar con --compressed")
+    return args
@@ -0,0 +1,65 @@
+import numpy as np
+
+from .config import (EMPTY, TREE_YOUNG, TREE_MATURE, TREE_OLD, FIRE_LOW, FIRE_MEDIUM, FIRE_HIGH,
+                     BURNED, ASH, WATER, FIRE_BASE)
+
+
+def get_color_for_process(process_rank):
+    """Obtener color único para cada proceso"""
+    colors = [
+        "#FF0000",  
+        "#800080",  
+        "#0000FF",  
+        "#FFFF00",  
+        "#FF00FF",  
+        "#00FFFF",  
+        "#FFA500",  
+        "#00FF00",  
+        "#FFC0CB",  
+        "#A52A2A",  
+    ]
+    return colors[process_rank % len(colors)]
+
+def get_color_advanced(state, process_info=None):
+    """Colores mejorados con soporte para fuegos por proceso"""
+    if state >= FIRE_BASE:
+        process_rank = state - FIRE_BASE
+        return get_color_for_process(process_rank)
+    
+    colors = {
+        EMPTY: "#8B4513",        
+        TREE_YOUNG: "#90EE90",   
+        TREE_MATURE: "#228B22",  
+        TREE_OLD: "#006400",     
+        FIRE_LOW: "#FF4500",     
+        FIRE_MEDIUM: "#FF0000",  
+        FIRE_HIGH: "#8B0000",    
+        BURNED: "#2F2F2F",       
+        ASH: "#696969",          
+        WATER: "#4169E1"         
+    }
+    return colors.get(state, "#000000")
+
+def hex_to_rgb(color):
+    return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+
+def state_rgb_lut(num_processes):
+    """Tabla (estado -> RGB uint8) con los mismos colores que get_color_advanced
+
+    Cubre los estados base y los fuegos de ``num_processes`` procesos; con ella un
+    frame entero se colorea con una sola indexación: ``lut[np.clip(frame, 0, len(lut) - 1)]``.
+    """
+    size = FIRE_BASE + max(1, num_processes)
+    return np.array([hex_to_rgb(get_color_advanced(state)) for state in range(size)], dtype=np.uint8)
+
+def frame_rgb(frame, lut, scale=1):
+    """Imagen RGB (alto, ancho, 3) de un frame de estados; cada celda ocupa scale x scale píxeles"""
+    rgb = lut[np.clip(frame, 0, len(lut) - 1)]
+    if scale > 1:
+        rgb = np.repeat(np.repeat(rgb, scale, axis=0), scale, axis=1)
+    return rgb
+
+def encode_ppm(rgb):
+    """Bytes de una imagen PPM binaria (P6), que Tk y casi cualquier visor abren"""
+    height, width = rgb.shape[:2]
+    return b'P6 %d %d 255\n' % (width, height) + np.ascontiguousarray(rgb).tobytes()
@@ -0,0 +1,312 @@
+import logging
+import random
+
+import numpy as np
+
+from .config import TREE_YOUNG, TREE_MATURE, TREE_OLD, BURNED, ASH, FIRE_BASE, default_fire_params
+from .decomposition import intersect_boxes
+from .engine import StepWorkspace, climate_factor
+from .kernels import cell_uniforms
+from .terrain import generate_noise_terrain
+
+logger = logging.getLogger(__name__)
+
+# Los estados caben en 16 bits; el -1 de fuera de la malla también
+STATE_DTYPE = np.int16
+
+
+class DenseBlock:
+    """Bloque expandido: estado actual, búfer del paso siguiente y campos fijos"""
+
+    def __init__(self, box, state, elevation, humidity, temperature, params):
+        self.box = box
+        self.state = state.astype(STATE_DTYPE)
+        self.next_state = np.empty_like(self.state)
+        self.elevation = elevation
+        self.humidity = humidity
+        self.temperature = temperature
+        self.climate = climate_factor(humidity, temperature, params)
+        self.climate_key = params['humidity_base']
+        self.touched = False
+
+    def climate_factor(self, params):
+        """Factor de humedad y temperatura, recalculado solo si cambia humidity_base"""
+        key = params['humidity_base']
+        if key != self.climate_key:
+            climate_factor(self.humidity, self.temperature, params, out=self.climate)
+            self.climate_key = key
+        return self.climate
+
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in
+                   ('state', 'next_state', 'elevation', 'humidity', 'temperature', 'climate'))
+
+
+class CompressedRegion:
+    """Región guardada por bloques; solo los bloques cerca del fuego son arreglos densos
+
+    Un bloque intacto no ocupa memoria (se regenera desde la semilla), uno uniforme
+    guarda un solo valor, uno ya quemado y quieto solo su estado en 16 bits, y uno
+    expandido además sus campos fijos.
+    Los números aleatorios dependen de la celda global, no del bloque ni del proceso.
+    """
+
+    def __init__(self, bounds, seed, model, process_rank, params=None, block_size=32, halo=1):
+        self.bounds = bounds
+        self.seed = seed
+        self.model = model
+        self.process_rank = process_rank
+        self.fire_state = FIRE_BASE + process_rank
+        self.params = params if params is not None else default_fire_params()
+        self.block_size = block_size
+        self.halo = halo
+
+        # Bloques alineados con la malla global y recortados a la región
+        r0, r1, c0, c1 = bounds
+        self.block_rows = range(r0 // block_size, (r1 - 1) // block_size + 1)
+        self.block_cols = range(c0 // block_size, (c1 - 1) // block_size + 1)
+        self.uniform = {}
+        self.static = {}
+        self.dense = {}
+        self.workspaces = {}
+        # Región densa armada por to_dense y bloques tocados compactados desde entonces
+        self.snapshot = None
+        self.stale = set()
+        # Estados que pueden cambiar solos o propagar fuego
+        self.active_lut = model.fire_lut | (model.transition_upper > 0).any(axis=0)
+
+    def block_box(self, key):
+        b = self.block_size
+        return intersect_boxes((key[0] * b, (key[0] + 1) * b, key[1] * b, (key[1] + 1) * b), self.bounds)
+
+    def block_keys(self):
+        return [(bi, bj) for bi in self.block_rows for bj in self.block_cols]
+
+    def _generate(self, key):
+        """Terreno original del bloque recortado a la región"""
+        box = self.block_box(key)
+        return box, generate_noise_terrain(self.seed, *box)
+
+    def expand(self, key):
+        """Arreglo denso del bloque, creado si hace falta"""
+        block = self.dense.get(key)
+        if block is None:
+            box, (state, elevation, humidity, temperature) = self._generate(key)
+            touched = key in self.uniform or key in self.static
+            if key in self.uniform:
+                state = np.full(state.shape, self.uniform.pop(key))
+            elif key in self.static:
+                state = self.static.pop(key)
+            block = DenseBlock(box, state, elevation, humidity, temperature, self.params)
+            block.touched = touched
+            self.dense[key] = block
+        return block
+
+    def initialize_fires(self, fire_states=None):
+        """Focos iniciales en celdas al azar de la región, como initialize_process_fires"""
+        r0, r1, c0, c1 = self.bounds
+        num_fires = random.randint(2, 5)
+        fires_created = 0
+        for _ in range(num_fires):
+            i = random.randint(r0, r1 - 1)
+            j = random.randint(c0, c1 - 1)
+            block = self.expand((i // self.block_size, j // self.block_size))
+            cell = (i - block.box[0], j - block.box[2])
+            if block.state[cell] in [TREE_YOUNG, TREE_MATURE, TREE_OLD]:
+                block.state[cell] = random.choice(fire_states) if fire_states else self.fire_state
+                block.touched = True
+                fires_created += 1
+        logger.info(f"Inicializados {fires_created} focos de incendio para proceso {self.process_rank}")
+
+    def _cell_blocks(self, rows, cols):
+        """Agrupar celdas globales por bloque: (bloque expandido, filas y columnas en él, máscara)"""
+        keys = np.stack([rows // self.block_size, cols // self.block_size], axis=1)
+        for key in np.unique(keys, axis=0):
+            block = self.expand((int(key[0]), int(key[1])))
+            mask = (keys[:, 0] == key[0]) & (keys[:, 1] == key[1])
+            yield block, rows[mask] - block.box[0], cols[mask] - block.box[2], mask
+
+    def read_cells(self, rows, cols):
+        """Estado de celdas en coordenadas globales (expande sus bloques)"""
+        values = np.empty(len(rows), dtype=STATE_DTYPE)
+        for block, block_rows, block_cols, mask in self._cell_blocks(rows, cols):
+            values[mask] = block.state[block_rows, block_cols]
+        return values
+
+    def write_cells(self, rows, cols, values):
+        """Escribir estados en coordenadas globales; los bloques quedan expandidos y marcados"""
+        for block, block_rows, block_cols, mask in self._cell_blocks(rows, cols):
+            block.state[block_rows, block_cols] = values[mask]
+            block.touched = True
+
+    def _neighbors(self, key):
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                neighbor = (key[0] + di, key[1] + dj)
+                if (di or dj) and neighbor[0] in self.block_rows and neighbor[1] in self.block_cols:
+                    yield di, dj, neighbor
+
+    def _threatened(self, key, fire):
+        """Bloques vecinos con fuego a menos de ``halo`` celdas de su borde común"""
+        h = self.halo
+        near_row = {-1: fire[:h].any(), 0: True, 1: fire[-h:].any()}
+        near_col = {-1: fire[:, :h].any(), 0: True, 1: fire[:, -h:].any()}
+        return [neighbor for di, dj, neighbor in self._neighbors(key) if near_row[di] and near_col[dj]]
+
+    def _padded_window(self, key):
+        """Estado y elevación del bloque con una celda de los bloques vecinos expandidos"""
+        block = self.dense[key]
+        box = block.box
+        window = (box[0] - 1, box[1] + 1, box[2] - 1, box[3] + 1)
+        # Los vecinos sin expandir no arden: cuentan como fuera de la malla
+        state = np.full((box[1] - box[0] + 2, box[3] - box[2] + 2), -1, dtype=STATE_DTYPE)
+        elevation = np.pad(block.elevation, 1, mode='edge')
+        for neighbor in [key] + [n for _, _, n in self._neighbors(key)]:
+            other = self.dense.get(neighbor)
+            if other is None:
+                continue
+            overlap = intersect_boxes(other.box, window)
+            if overlap is None:
+                continue
+            dst = (slice(overlap[0] - window[0], overlap[1] - window[0]),
+                   slice(overlap[2] - window[2], overlap[3] - window[2]))
+            src = (slice(overlap[0] - other.box[0], overlap[1] - other.box[0]),
+                   slice(overlap[2] - other.box[2], overlap[3] - other.box[2]))
+            state[dst] = other.state[src]
+            elevation[dst] = other.elevation[src]
+        return state, elevation
+
+    def _workspace(self, shape):
+        work = self.workspaces.get(shape)
+        if work is None:
+            work = self.workspaces[shape] = StepWorkspace(shape)
+        return work
+
+    def step(self, step, wind=None):
+        """Avanzar un paso solo en los bloques con fuego y sus vecinos
+
+        Con un ``WindField`` cada bloque toma los factores de viento de su rectángulo.
+        """
+        model = self.model
+        live = []
+        for key, block in list(self.dense.items()):
+            index = model.index(block.state)
+            if self.active_lut[index].any():
+                live.append(key)
+                for neighbor in self._threatened(key, model.fire_lut[index]):
+                    self.expand(neighbor)
+
+        compute = set(live)
+        for key in live:
+            compute.update(n for _, _, n in self._neighbors(key) if n in self.dense)
+
+        fires_spread = fires_extinguished = 0
+        for key in compute:
+            block = self.dense[key]
+            state, elevation = self._padded_window(key)
+            height, width = block.state.shape
+            r0, r1, c0, c1 = block.box
+            work = self._workspace(block.state.shape)
+            work.draw[...] = cell_uniforms(self.seed, step, np.arange(r0, r1), np.arange(c0, c1))
+            _, spread, extinguished = model.step_window(
+                state, elevation, slice(1, height + 1), slice(1, width + 1), block.humidity,
+                block.temperature, work.draw, self.params, self.fire_state, out=block.next_state,
+                work=work, climate=block.climate_factor(self.params),
+                wind=None if wind is None else wind.planes(block.box))
+            fires_spread += spread
+            fires_extinguished += extinguished
+
+        # Todos los bloques leyeron el estado anterior: ahora se alternan los búferes
+        for key in compute:
+            block = self.dense[key]
+            if key in live or not np.array_equal(block.state, block.next_state):
+                block.touched = True
+            block.state, block.next_state = block.next_state, block.state
+
+        compacted = self.compact()
+        if fires_extinguished > 0 or fires_spread > 0:
+            logger.info("Proceso %d, Paso %d: %d nuevos fuegos, %d extinguidos, %d bloques densos, "
+                        "%d compactados", self.process_rank, step, fires_spread, fires_extinguished,
+                        len(self.dense), compacted, extra={'step': step})
+
+    def compact(self):
+        """Devolver a forma compacta los bloques que ya no pueden cambiar"""
+        model = self.model
+        quiet = [key for key, block in self.dense.items()
+                 if not self.active_lut[model.index(block.state)].any()]
+        quiet_set = set(quiet)
+        compacted = 0
+        for key in quiet:
+            # Un vecino con fuego todavía puede escribir en este bloque
+            if any(n in self.dense and n not in quiet_set for _, _, n in self._neighbors(key)):
+                continue
+            block = self.dense[key]
+            first = block.state.flat[0]
+            if not block.touched:
+                # Intacto: se puede volver a generar desde la semilla
+                pass
+            elif np.all(block.state == first):
+                self.uniform[key] = int(first)
+            else:
+                self.static[key] = block.state
+            if block.touched:
+                self.stale.add(key)
+            del self.dense[key]
+            compacted += 1
+        return compacted
+
+    def active_fires(self):
+        """Número de celdas en llamas de la región"""
+        return int(sum(np.count_nonzero(self.model.fire_lut[self.model.index(block.state)])
+                       for block in self.dense.values()))
+
+    def state_counts(self):
+        """Celdas en llamas, quemadas y en ceniza contadas por bloque, sin armar la región
+
+        Los bloques intactos son terreno recién generado: no tienen ninguna de las tres.
+        """
+        counts = {'fires': self.active_fires()}
+        for name, state in (('burned', BURNED), ('ash', ASH)):
+            total = sum(np.count_nonzero(block.state == state) for block in self.dense.values())
+            total += sum(np.count_nonzero(states == state) for states in self.static.values())
+            for key, value in self.uniform.items():
+                if value == state:
+                    r0, r1, c0, c1 = self.block_box(key)
+                    total += (r1 - r0) * (c1 - c0)
+            counts[name] = int(total)
+        return counts
+
+    def to_dense(self):
+        """Región completa como arreglo denso de STATE_DTYPE, solo para armar un frame
+
+        El arreglo se reserva en la primera llamada y se reutiliza: después solo se reescriben
+        los bloques expandidos y los tocados que se compactaron desde la llamada anterior.
+        """
+        r0, r1, c0, c1 = self.bounds
+        if self.snapshot is None:
+            self.snapshot = np.empty((r1 - r0, c1 - c0), dtype=STATE_DTYPE)
+            keys = self.block_keys()
+        else:
+            keys = self.stale.union(self.dense)
+        self.stale = set()
+        forest = self.snapshot
+        for key in keys:
+            box = self.block_box(key)
+            local = (slice(box[0] - r0, box[1] - r0), slice(box[2] - c0, box[3] - c0))
+            if key in self.dense:
+                forest[local] = self.dense[key].state
+            elif key in self.uniform:
+                forest[local] = self.uniform[key]
+            elif key in self.static:
+                forest[local] = self.static[key]
+            else:
+                forest[local] = self._generate(key)[1][0]
+        return forest
+
+    def nbytes(self):
+        """Memoria de los bloques expandidos y los auxiliares"""
+        total = sum(block.nbytes() for block in self.dense.values())
+        total += sum(state.nbytes for state in self.static.values())
+        for work in self.workspaces.values():
+            total += sum(array.nbytes for array in vars(work).values())
+        return total
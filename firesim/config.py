@@ -0,0 +1,44 @@
+ROWS, COLS = 60, 80
+STEPS = 500
+CELL_SIZE = 8
+
+
+PROB_BASE = 0.15
+HUMIDITY_BASE = 0.7
+TEMP_BASE = 25
+WIND_DIRECTION = 'SE'
+WIND_SPEED = 2.5
+ELEVATION_FACTOR = 0.1
+
+
+EMPTY = 0
+TREE_YOUNG = 1
+TREE_MATURE = 2
+TREE_OLD = 3
+FIRE_LOW = 4
+FIRE_MEDIUM = 5
+FIRE_HIGH = 6
+BURNED = 7
+ASH = 8
+WATER = 9
+
+FIRE_BASE = 10
+
+
+NEIGHBOR_DIRECTIONS = [(-1,-1), (-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0), (1,1)]
+WIND_VECTORS = {
+    'N': (-1, 0), 'NE': (-1, 1), 'E': (0, 1), 'SE': (1, 1),
+    'S': (1, 0), 'SW': (1, -1), 'W': (0, -1), 'NW': (-1, -1)
+}
+
+
+def default_fire_params():
+    """Parámetros del modelo de fuego tomados de la configuración global"""
+    return {
+        'wind_direction': WIND_DIRECTION,
+        'wind_speed': WIND_SPEED,
+        'prob_base': PROB_BASE,
+        'humidity_base': HUMIDITY_BASE,
+        'elevation_factor': ELEVATION_FACTOR,
+    }
+
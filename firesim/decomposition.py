@@ -0,0 +1,56 @@
+import numpy as np
+
+
+def get_region_bounds(rank, size, total_rows, total_cols):
+    """Calcular los límites de la región para cada proceso"""
+    if size == 1:
+        return 0, total_rows, 0, total_cols
+    
+    
+    if size <= 4:
+        
+        rows_per_proc = total_rows // size
+        row_start = rank * rows_per_proc
+        row_end = (rank + 1) * rows_per_proc if rank < size - 1 else total_rows
+        return row_start, row_end, 0, total_cols
+    else:
+        
+        grid_rows = int(np.sqrt(size))
+        grid_cols = size // grid_rows
+        if grid_rows * grid_cols < size:
+            grid_cols += 1
+        
+        proc_row = rank // grid_cols
+        proc_col = rank % grid_cols
+        
+        rows_per_grid = total_rows // grid_rows
+        cols_per_grid = total_cols // grid_cols
+        
+        row_start = proc_row * rows_per_grid
+        row_end = min((proc_row + 1) * rows_per_grid, total_rows)
+        col_start = proc_col * cols_per_grid
+        col_end = min((proc_col + 1) * cols_per_grid, total_cols)
+        
+        return row_start, row_end, col_start, col_end
+
+
+def intersect_boxes(a, b):
+    """Intersección de dos rectángulos (fila_ini, fila_fin, col_ini, col_fin)"""
+    box = (max(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), min(a[3], b[3]))
+    if box[0] >= box[1] or box[2] >= box[3]:
+        return None
+    return box
+
+
+def build_halo_plan(process_rank, all_bounds, depth):
+    """Celdas a enviar y recibir con cada región vecina"""
+    r0, r1, c0, c1 = all_bounds[process_rank]
+    plan = []
+    for peer, (p0, p1, q0, q1) in enumerate(all_bounds):
+        if peer == process_rank:
+            continue
+        recv = intersect_boxes((p0, p1, q0, q1), (r0 - depth, r1 + depth, c0 - depth, c1 + depth))
+        send = intersect_boxes((r0, r1, c0, c1), (p0 - depth, p1 + depth, q0 - depth, q1 + depth))
+        if recv is not None or send is not None:
+            plan.append((peer, send, recv))
+    return plan
@@ -0,0 +1,260 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .config import (TREE_YOUNG, TREE_MATURE, TREE_OLD, FIRE_LOW, FIRE_MEDIUM, FIRE_HIGH, BURNED, ASH,
+                     FIRE_BASE, PROB_BASE, HUMIDITY_BASE, TEMP_BASE, NEIGHBOR_DIRECTIONS, WIND_VECTORS)
+
+
+FUEL_FACTORS = {
+    TREE_YOUNG: 0.8,   # Más resistente
+    TREE_MATURE: 1.0,
+    TREE_OLD: 1.3      # Más inflamable
+}
+
+# Modelo de app.py: tres intensidades de fuego según temperatura y humedad
+INTENSITY_MODEL = {
+    'name': 'intensidad',
+    'spread_probability': {FIRE_LOW: 0.1, FIRE_MEDIUM: 0.2, FIRE_HIGH: 0.35},
+    'transitions': {
+        FIRE_LOW: [(BURNED, 0.1)],
+        FIRE_MEDIUM: [(BURNED, 0.1)],
+        FIRE_HIGH: [(BURNED, 0.1)],
+        BURNED: [(ASH, 0.05)],
+    },
+    'fuel_factor': FUEL_FACTORS,
+    'max_ignition_probability': 0.8,
+    # (temperatura mínima, humedad máxima, estado): gana la primera regla que se cumple
+    'ignition': [(30, 0.4, FIRE_HIGH), (25, 0.6, FIRE_MEDIUM)],
+    'ignition_default': FIRE_LOW,
+    'initial_fire_states': [FIRE_LOW, FIRE_MEDIUM, FIRE_HIGH],
+}
+
+
+def process_fire_model(nprocs):
+    """Modelo de fire_simulation.py: un estado de fuego por proceso dueño de la región"""
+    fire_states = [FIRE_BASE + r for r in range(max(1, nprocs))]
+    transitions = {state: [(BURNED, 0.05)] for state in fire_states}
+    transitions[BURNED] = [(ASH, 0.02)]
+    return {
+        'name': 'procesos',
+        'spread_probability': {state: 0.35 for state in fire_states},
+        'transitions': transitions,
+        'fuel_factor': FUEL_FACTORS,
+        'max_ignition_probability': 0.7,
+        'ignition': [],
+        # Sin estado fijo: la celda toma el fuego del proceso dueño
+        'ignition_default': None,
+        'initial_fire_states': None,
+    }
+
+
+class CompiledFireModel:
+    """Descripción de un modelo traducida a tablas indexadas por estado"""
+
+    def __init__(self, model):
+        self.model = model
+        states = set(model['spread_probability']) | set(model['fuel_factor']) | set(model['transitions'])
+        for targets in model['transitions'].values():
+            states.update(target for target, _ in targets)
+        # Índice = estado + 1: el -1 de las celdas fuera de la malla cae en la posición 0
+        size = max(states) + 2
+        self.num_states = size
+
+        self.spread_lut = np.zeros(size)
+        for state, prob in model['spread_probability'].items():
+            self.spread_lut[state + 1] = prob
+        self.fuel_lut = np.zeros(size)
+        for state, factor in model['fuel_factor'].items():
+            self.fuel_lut[state + 1] = factor
+        self.fire_lut = self.spread_lut > 0
+
+        # Transiciones espontáneas con umbrales acumulados sobre un único número aleatorio
+        depth = max((len(t) for t in model['transitions'].values()), default=0)
+        self.transition_upper = np.zeros((depth, size))
+        self.transition_target = np.tile(np.arange(-1, size - 1), (depth, 1))
+        for state, targets in model['transitions'].items():
+            cumulative = 0.0
+            for k, (target, rate) in enumerate(targets):
+                cumulative += rate
+                self.transition_upper[k, state + 1] = cumulative
+                self.transition_target[k, state + 1] = target
+
+        self.max_ignition = model['max_ignition_probability']
+        self.ignition_rules = model['ignition']
+        self.ignition_default = model['ignition_default']
+        self.initial_fire_states = model['initial_fire_states']
+
+    def index(self, states, out=None, mask=None):
+        """Posición en las tablas; estados desconocidos se tratan como fuera de la malla"""
+        if out is None:
+            out = np.empty(states.shape, dtype=np.intp)
+            mask = np.empty(states.shape, dtype=bool)
+        np.add(states, 1, out=out, casting='unsafe')
+        np.less(out, 0, out=mask)
+        out[mask] = 0
+        np.greater_equal(out, self.num_states, out=mask)
+        out[mask] = 0
+        return out
+
+    def is_fire(self, forest):
+        """Máscara de celdas en llamas"""
+        return self.fire_lut[self.index(forest)]
+
+    def step_window(self, padded_forest, padded_elevation, rows, cols, humidity, temperature,
+                    draw, params, ignition_state, out=None, work=None, climate=None, wind=None):
+        """Nuevo estado de la ventana rows x cols de un arreglo ampliado (vecinos en ±1)
+
+        Con ``out``, ``work`` y ``climate`` preasignados el paso no reserva memoria.
+        ``wind`` son factores de viento por dirección (8, alto, ancho) que reemplazan
+        al viento constante de ``params``.
+        """
+        cell = padded_forest[rows, cols]
+        height, width = cell.shape
+        if work is None:
+            work = StepWorkspace(cell.shape)
+        if out is None:
+            out = np.empty_like(cell)
+        if climate is None:
+            climate = climate_factor(humidity, temperature, params)
+        cell_index = self.index(cell, work.index, work.mask)
+        cell_elevation = padded_elevation[rows, cols]
+
+        # Probabilidad base de cada vecino, leída una sola vez para las 8 direcciones
+        outer = (slice(rows.start - 1, rows.stop + 1), slice(cols.start - 1, cols.stop + 1))
+        outer_index = self.index(padded_forest[outer], work.outer_index, work.outer_mask)
+        neighbor_base = np.take(self.spread_lut, outer_index, out=work.neighbor_base)
+
+        neighbor_sum = work.neighbor_sum
+        neighbor_sum.fill(0.0)
+        term = work.term
+        for k, (dx, dy) in enumerate(NEIGHBOR_DIRECTIONS):
+            base = neighbor_base[1 + dx:1 + dx + height, 1 + dy:1 + dy + width]
+            if not base.any():
+                continue
+            neighbor_elevation = padded_elevation[rows.start + dx:rows.stop + dx, cols.start + dy:cols.stop + dy]
+            direction_factor(k, cell_elevation, neighbor_elevation, params, wind, out=term, mask=work.mask)
+            term *= base
+            neighbor_sum += term
+
+        # La suma de vecinos se convierte en la probabilidad de ignición sin otro arreglo
+        fire_prob = neighbor_sum
+        fire_prob *= np.take(self.fuel_lut, cell_index, out=term)
+        fire_prob *= climate
+        fire_prob *= params['prob_base'] / PROB_BASE
+        np.minimum(fire_prob, self.max_ignition, out=fire_prob)
+        # Sin combustible la probabilidad es 0 y draw < 0 nunca se cumple
+        ignite = np.less(draw, fire_prob, out=work.ignite)
+
+        # Umbrales acumulados en orden inverso: la primera transición que se cumple se escribe al final
+        np.copyto(out, cell)
+        for k in reversed(range(self.transition_upper.shape[0])):
+            np.less(draw, np.take(self.transition_upper[k], cell_index, out=term), out=work.mask)
+            np.copyto(out, np.take(self.transition_target[k], cell_index, out=work.target), where=work.mask)
+
+        fires_spread = int(np.count_nonzero(ignite))
+        if fires_spread:
+            np.copyto(out, self.ignition_states(ignition_state, humidity, temperature, work), where=ignite)
+
+        # Fuegos que dejaron de arder en este paso
+        was_fire = np.take(self.fire_lut, cell_index, out=work.was_fire)
+        new_index = self.index(out, work.index, work.mask)
+        np.take(self.fire_lut, new_index, out=work.mask)
+        np.logical_not(work.mask, out=work.mask)
+        work.mask &= was_fire
+        fires_extinguished = int(np.count_nonzero(work.mask))
+        return out, fires_spread, fires_extinguished
+
+    def ignition_states(self, ignition_state, humidity, temperature, work=None):
+        """Estado que toma cada celda al encenderse"""
+        default = self.ignition_default if self.ignition_default is not None else ignition_state
+        if not self.ignition_rules:
+            return default
+        target = work.target if work is not None else np.empty(humidity.shape, dtype=np.intp)
+        np.copyto(target, default)
+        for min_temperature, max_humidity, state in reversed(self.ignition_rules):
+            target[(temperature > min_temperature) & (humidity < max_humidity)] = state
+        return target
+
+
+class StepWorkspace:
+    """Arreglos auxiliares de step_window, reservados una vez por bloque"""
+
+    def __init__(self, shape):
+        height, width = shape
+        outer = (height + 2, width + 2)
+        self.index = np.empty(shape, dtype=np.intp)
+        self.outer_index = np.empty(outer, dtype=np.intp)
+        self.outer_mask = np.empty(outer, dtype=bool)
+        self.neighbor_base = np.empty(outer)
+        self.neighbor_sum = np.empty(shape)
+        self.term = np.empty(shape)
+        self.draw = np.empty(shape)
+        self.target = np.empty(shape, dtype=np.intp)
+        self.mask = np.empty(shape, dtype=bool)
+        self.was_fire = np.empty(shape, dtype=bool)
+        self.ignite = np.empty(shape, dtype=bool)
+
+    def rows(self, height):
+        """Vista de las primeras ``height`` filas, para un bloque más corto que el resto"""
+        view = StepWorkspace.__new__(StepWorkspace)
+        extra = {name: array.shape[0] - self.index.shape[0] for name, array in vars(self).items()}
+        for name, array in vars(self).items():
+            setattr(view, name, array[:height + extra[name]])
+        return view
+
+
+def wind_factor(k, params, wind=None):
+    """Factor de viento de la dirección k: el plano k del campo o el viento constante de params"""
+    if wind is not None:
+        return wind[k]
+    dx, dy = NEIGHBOR_DIRECTIONS[k]
+    wind_vector = WIND_VECTORS.get(params['wind_direction'], (0, 0))
+    if (dx, dy) == wind_vector:
+        return 1 + (params['wind_speed'] * 0.3)
+    if (-dx, -dy) == wind_vector:
+        return 1 - (params['wind_speed'] * 0.1)
+    return 1.0
+
+
+def direction_factor(k, cell_elevation, neighbor_elevation, params, wind=None, out=None, mask=None):
+    """Factor de viento y pendiente con que arde una celda desde su vecino en la dirección k"""
+    if out is None:
+        out = np.empty(cell_elevation.shape)
+        mask = np.empty(cell_elevation.shape, dtype=bool)
+    elevation_factor = params['elevation_factor']
+    # elev_factor = 1 + ef si la celda está más alta que el vecino, si no 1 - ef/2
+    np.greater(cell_elevation, neighbor_elevation, out=mask)
+    np.multiply(mask, 1.5 * elevation_factor, out=out)
+    out += 1 - elevation_factor * 0.5
+    out *= wind_factor(k, params, wind)
+    return out
+
+
+def climate_factor(humidity, temperature, params, out=None):
+    """Factor fijo de humedad y temperatura de cada celda"""
+    if out is None:
+        out = np.empty(humidity.shape)
+    np.add(humidity, params['humidity_base'] - HUMIDITY_BASE, out=out)
+    np.clip(out, 0.0, 1.0, out=out)
+    np.subtract(1.0, out, out=out)
+    out *= 1 + (temperature - TEMP_BASE) * 0.02
+    return out
+
+
+@lru_cache(maxsize=None)
+def compiled_process_model(nprocs):
+    """Modelo por procesos compilado (uno por tamaño de comunicador)"""
+    return CompiledFireModel(process_fire_model(nprocs))
+
+
+@lru_cache(maxsize=None)
+def compiled_intensity_model():
+    return CompiledFireModel(INTENSITY_MODEL)
+
+
+def build_fire_model(name, nprocs):
+    """Modelo compilado por nombre ('procesos' o 'intensidad')"""
+    if name == 'intensidad':
+        return compiled_intensity_model()
+    return compiled_process_model(nprocs)
@@ -0,0 +1,89 @@
+import logging
+
+import numpy as np
+from mpi4py import MPI
+
+from .config import ROWS, COLS
+from .decomposition import get_region_bounds
+from .engine import compiled_process_model
+from .exchange import RegionExchange
+from .kernels import StateBuffers, spread_process_fire, affected_cells
+from .terrain import generate_terrain, initialize_region_fires, seed_realization
+
+logger = logging.getLogger(__name__)
+
+
+def run_ensemble(world_comm, realizations, group_size, seed, steps, output, threads=1, terrain='ruido',
+                 cache=None):
+    """Ejecutar realizaciones independientes en grupos de procesos"""
+    world_rank = world_comm.Get_rank()
+    world_size = world_comm.Get_size()
+    group_size = max(1, min(group_size, world_size))
+    num_groups = world_size // group_size
+
+    group_id = world_rank // group_size
+    color = group_id if group_id < num_groups else MPI.UNDEFINED
+    group_comm = world_comm.Split(color, world_rank)
+
+    burn_counts = np.zeros((ROWS, COLS), dtype=np.int64)
+    burned_areas = []
+
+    if group_comm != MPI.COMM_NULL:
+        group_rank = group_comm.Get_rank()
+        model = compiled_process_model(group_size)
+        bounds = get_region_bounds(group_rank, group_size, ROWS, COLS)
+        r_start, r_end, c_start, c_end = bounds
+
+        # Mismo paisaje en todos los grupos: la semilla solo depende de la región
+        np.random.seed(seed + group_rank)
+        base_forest, elevation, humidity, temperature = generate_terrain(terrain, seed, *bounds, cache=cache)
+        # Celdas fantasma dentro del grupo: el fuego cruza entre las regiones de la realización
+        exchange = RegionExchange(group_comm, group_rank, group_size, base_forest, elevation,
+                                  humidity=humidity, temperature=temperature)
+        buffers = StateBuffers(base_forest, elevation, humidity, temperature, threads,
+                               exchange.padded_elevation)
+
+        for realization in range(group_id, realizations, num_groups):
+            # Los focos se sortean igual en todo el grupo; la propagación, con un flujo por proceso
+            seed_realization(seed, realization, 0)
+            forest = initialize_region_fires(buffers.load(base_forest), bounds, group_rank, ROWS, COLS)
+            seed_realization(seed, realization, group_rank)
+
+            for step in range(steps):
+                exchange.fill_ghosts(forest, buffers.padded)
+                forest = spread_process_fire(forest, elevation, humidity, temperature,
+                                             group_rank, step, threads=threads, buffers=buffers,
+                                             model=model)
+
+            burned = affected_cells(forest)
+            burn_counts[r_start:r_end, c_start:c_end] += burned
+            area = group_comm.allreduce(int(np.count_nonzero(burned)), op=MPI.SUM)
+
+            if group_rank == 0:
+                burned_areas.append((realization, area))
+                print(f"[Rank {world_rank}] Realización {realization}: {area} celdas afectadas")
+
+        group_comm.Free()
+
+    total_counts = np.zeros_like(burn_counts) if world_rank == 0 else None
+    world_comm.Reduce(burn_counts, total_counts, op=MPI.SUM, root=0)
+    all_areas = world_comm.gather(burned_areas, root=0)
+
+    if world_rank == 0:
+        areas = sorted(item for group_areas in all_areas for item in group_areas)
+        burn_probability = total_counts / max(realizations, 1)
+        np.save(f"{output}_burn_probability.npy", burn_probability)
+
+        with open(f"{output}_burned_areas.csv", 'w') as f:
+            f.write("realization,burned_cells\n")
+            for realization, area in areas:
+                f.write(f"{realization},{area}\n")
+
+        values = np.array([area for _, area in areas], dtype=float)
+        print(f"ENSEMBLE COMPLETADO: {len(areas)} realizaciones en {num_groups} grupos de {group_size} procesos")
+        if len(values):
+            p10, p50, p90 = np.percentile(values, [10, 50, 90])
+            print(f"   Área afectada: media {values.mean():.1f} | desv {values.std():.1f} | "
+                  f"P10 {p10:.0f} | P50 {p50:.0f} | P90 {p90:.0f}")
+        print(f"   Resultados: {output}_burn_probability.npy, {output}_burned_areas.csv")
+        logger.info(f"Ensemble completado: {len(areas)} realizaciones")
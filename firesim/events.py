@@ -0,0 +1,138 @@
+import json
+import logging
+
+import numpy as np
+
+from .config import EMPTY, WATER
+from .decomposition import get_region_bounds
+
+logger = logging.getLogger(__name__)
+
+# Estado que deja cada intervención en sus celdas
+INTERVENTION_STATES = {'firebreak': EMPTY, 'water': WATER}
+# Marcador de ignición: el proceso dueño lo cambia por su estado de fuego
+IGNITE = -2
+PARAM_EVENTS = ('wind', 'params')
+
+
+def load_events(path):
+    """Eventos de un archivo JSON-lines, uno por línea con al menos 'step' y 'type'
+
+    Tipos: ``ignite`` y ``firebreak``/``water`` con 'cells' ([[fila, col], ...]) o una
+    línea 'from'/'to' de ancho 'width'; ``wind`` con 'direction' y/o 'speed'; ``params``
+    con cualquier parámetro del modelo.
+    """
+    events = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                events.append(json.loads(line))
+    return events
+
+
+def line_cells(start, end, width=1):
+    """Celdas de la recta entre dos celdas, ensanchada a ``width`` celdas"""
+    (r0, c0), (r1, c1) = start, end
+    n = max(abs(r1 - r0), abs(c1 - c0)) + 1
+    rows = np.rint(np.linspace(r0, r1, n)).astype(np.int64)
+    cols = np.rint(np.linspace(c0, c1, n)).astype(np.int64)
+    if width > 1:
+        offsets = np.arange(width) - (width - 1) // 2
+        # Se ensancha en la dirección que cruza la recta
+        if abs(c1 - c0) >= abs(r1 - r0):
+            rows, cols = (rows[:, None] + offsets).ravel(), np.repeat(cols, width)
+        else:
+            rows, cols = np.repeat(rows, width), (cols[:, None] + offsets).ravel()
+    return rows, cols
+
+
+def compile_cell_events(events):
+    """Eventos de celdas en cuatro arreglos: paso, fila global, columna global y valor"""
+    parts = []
+    for event in events:
+        kind = event['type']
+        if kind in PARAM_EVENTS:
+            continue
+        if kind == 'ignite':
+            value = IGNITE
+        elif kind in INTERVENTION_STATES:
+            value = INTERVENTION_STATES[kind]
+        else:
+            raise ValueError(f"Tipo de evento desconocido: {kind}")
+        if 'cells' in event:
+            cells = np.asarray(event['cells'], dtype=np.int64).reshape(-1, 2)
+            rows, cols = cells[:, 0], cells[:, 1]
+        else:
+            rows, cols = line_cells(event['from'], event['to'], event.get('width', 1))
+        parts.append((np.full(rows.shape, event['step']), rows, cols, np.full(rows.shape, value)))
+    if not parts:
+        return tuple(np.empty(0, dtype=np.int64) for _ in range(4))
+    return tuple(np.concatenate(column) for column in zip(*parts))
+
+
+def param_changes(event):
+    """Parámetros del modelo que cambia un evento ``wind`` o ``params``"""
+    if event['type'] == 'wind':
+        names = {'direction': 'wind_direction', 'speed': 'wind_speed'}
+        return {names[key]: value for key, value in event.items() if key in names}
+    return {key: value for key, value in event.items() if key not in ('step', 'type')}
+
+
+class EventSchedule:
+    """Eventos de un proceso ordenados por paso, en coordenadas locales
+
+    ``cell_steps`` son los pasos en que algún proceso escribe celdas, para que todos
+    puedan rehacer a la vez las celdas fantasma del bloque temporal.
+    """
+
+    def __init__(self, steps, rows, cols, values, changes, cell_steps=()):
+        order = np.argsort(steps, kind='stable')
+        self.steps = steps[order]
+        self.rows = rows[order]
+        self.cols = cols[order]
+        self.values = values[order]
+        self.changes = changes
+        self.cell_steps = set(cell_steps)
+
+    def __len__(self):
+        return len(self.steps) + len(self.changes)
+
+    def due(self, step):
+        """Celdas a escribir y cambios de parámetros del paso ``step``"""
+        lo, hi = np.searchsorted(self.steps, [step, step + 1])
+        changes = [change for change_step, change in self.changes if change_step == step]
+        return self.rows[lo:hi], self.cols[lo:hi], self.values[lo:hi], changes
+
+
+def route_events(comm, events, total_rows, total_cols):
+    """Repartir los eventos del rank 0 a los dueños de sus celdas (una sola operación colectiva)"""
+    payloads = None
+    if comm.Get_rank() == 0:
+        steps, rows, cols, values = compile_cell_events(events)
+        changes = sorted(((event['step'], param_changes(event)) for event in events
+                          if event['type'] in PARAM_EVENTS), key=lambda item: item[0])
+        inside = (rows >= 0) & (rows < total_rows) & (cols >= 0) & (cols < total_cols)
+        cell_steps = sorted(set(steps[inside].tolist()))
+        payloads = []
+        size = comm.Get_size()
+        for rank in range(size):
+            r0, r1, c0, c1 = get_region_bounds(rank, size, total_rows, total_cols)
+            mine = (rows >= r0) & (rows < r1) & (cols >= c0) & (cols < c1)
+            payloads.append((steps[mine], rows[mine] - r0, cols[mine] - c0, values[mine], changes, cell_steps))
+        routed = sum(len(payload[0]) for payload in payloads)
+        print(f"[Rank 0] Eventos: {len(events)} programados, {routed} de {len(rows)} celdas dentro de la malla, "
+              f"{len(changes)} cambios de parámetros")
+    schedule = EventSchedule(*comm.scatter(payloads, root=0))
+    logger.info(f"Eventos locales: {len(schedule.steps)} celdas, {len(schedule.changes)} cambios de parámetros")
+    return schedule
+
+
+def resolve_ignitions(model, current, values, fire_state):
+    """Cambiar el marcador de ignición por el estado de fuego; solo arde lo que tiene combustible
+
+    Devuelve la máscara de celdas a escribir y sus valores.
+    """
+    ignite = values == IGNITE
+    state = model.ignition_default if model.ignition_default is not None else fire_state
+    keep = ~ignite | (model.fuel_lut[model.index(current)] > 0)
+    return keep, np.where(ignite, state, values)
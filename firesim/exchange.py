@@ -0,0 +1,175 @@
+import logging
+import time
+
+import numpy as np
+from mpi4py import MPI
+
+from .config import ROWS, COLS, FIRE_BASE
+from .decomposition import get_region_bounds, intersect_boxes, build_halo_plan
+
+logger = logging.getLogger(__name__)
+
+HALO_TAG = 20
+
+
+class RegionExchange:
+    """Celdas fantasma entre regiones y recolección del bosque completo"""
+
+    def __init__(self, comm, process_rank, nprocs, forest, elevation, depth=1, shared_memory=False,
+                 humidity=None, temperature=None):
+        self.comm = comm
+        self.rank = process_rank
+        self.depth = depth
+        self.all_bounds = [get_region_bounds(r, nprocs, ROWS, COLS) for r in range(nprocs)]
+        self.bounds = self.all_bounds[process_rank]
+        self.plan = build_halo_plan(process_rank, self.all_bounds, depth)
+        # Acumulados para las métricas: espera en comunicaciones y bytes enviados
+        self.wait_time = 0.0
+        self.bytes_sent = 0
+
+        rows, cols = forest.shape
+        self.padded = np.full((rows + 2 * depth, cols + 2 * depth), -1, dtype=forest.dtype)
+        self.shared_views = {}
+        self.node_comm = None
+        if shared_memory:
+            self._setup_shared_window(forest)
+
+        # La elevación no cambia: sus celdas fantasma se intercambian una sola vez
+        self.padded_elevation = self.pad_static(elevation)
+        if humidity is not None:
+            self.padded_humidity = self.pad_static(humidity)
+        if temperature is not None:
+            self.padded_temperature = self.pad_static(temperature)
+
+        # Estado del bloque temporal y dueño de cada celda de la región ampliada
+        self.block_state = None
+        self.block_substep = 0
+        self.owner_state = np.full(self.padded.shape, -1, dtype=forest.dtype)
+        r0, r1, c0, c1 = self.bounds
+        for peer, box in enumerate(self.all_bounds):
+            overlap = intersect_boxes(box, (r0 - depth, r1 + depth, c0 - depth, c1 + depth))
+            if overlap is not None:
+                self.owner_state[self._padded(overlap)] = FIRE_BASE + peer
+
+    def pad_static(self, field):
+        """Ampliar un campo fijo con las celdas fantasma de los vecinos (una sola vez)"""
+        padded = np.pad(field, self.depth, mode='edge')
+        self._exchange_messages(field, padded, remote_only=False)
+        return padded
+
+    def pad_field(self, field, fill):
+        """Ampliar un campo con las celdas fantasma actuales de los vecinos; fuera de la malla, fill"""
+        d = self.depth
+        rows, cols = field.shape
+        padded = np.full((rows + 2 * d, cols + 2 * d), fill, dtype=field.dtype)
+        padded[d:d + rows, d:d + cols] = field
+        self._exchange_messages(field, padded, remote_only=False)
+        return padded
+
+    def _setup_shared_window(self, forest):
+        """Ubicar las regiones del nodo en una ventana de memoria compartida"""
+        self.node_comm = self.comm.Split_type(MPI.COMM_TYPE_SHARED, key=self.rank)
+        node_ranks = self.node_comm.allgather(self.rank)
+        self.window = MPI.Win.Allocate_shared(forest.nbytes, forest.dtype.itemsize, comm=self.node_comm)
+
+        for local_rank, world_rank in enumerate(node_ranks):
+            buf, _ = self.window.Shared_query(local_rank)
+            r0, r1, c0, c1 = self.all_bounds[world_rank]
+            self.shared_views[world_rank] = np.frombuffer(
+                buf, dtype=forest.dtype, count=(r1 - r0) * (c1 - c0)).reshape(r1 - r0, c1 - c0)
+        self.own_shared = self.shared_views[self.rank]
+        # Para el halo solo se publican las franjas que leen los vecinos del nodo
+        self.shared_strips = [self._local(send) for peer, send, _ in self.plan
+                              if send is not None and peer in self.shared_views]
+
+        is_leader = self.node_comm.Get_rank() == 0
+        self.leader_comm = self.comm.Split(0 if is_leader else MPI.UNDEFINED, self.rank)
+        self.window.Fence()
+        logger.info(f"Ventana compartida con {len(node_ranks)} procesos del nodo")
+
+    def _local(self, box):
+        r0, _, c0, _ = self.bounds
+        return slice(box[0] - r0, box[1] - r0), slice(box[2] - c0, box[3] - c0)
+
+    def _padded(self, box):
+        r0, _, c0, _ = self.bounds
+        d = self.depth
+        return slice(box[0] - r0 + d, box[1] - r0 + d), slice(box[2] - c0 + d, box[3] - c0 + d)
+
+    def _exchange_messages(self, local, padded, remote_only):
+        """Intercambio punto a punto con los vecinos (fuera del nodo si remote_only)"""
+        requests = []
+        send_buffers = []
+        received = []
+        for peer, send, recv in self.plan:
+            if remote_only and peer in self.shared_views:
+                continue
+            if recv is not None:
+                buf = np.empty((recv[1] - recv[0], recv[3] - recv[2]), dtype=local.dtype)
+                requests.append(self.comm.Irecv(buf, source=peer, tag=HALO_TAG))
+                received.append((buf, recv))
+            if send is not None:
+                buf = np.ascontiguousarray(local[self._local(send)])
+                requests.append(self.comm.Isend(buf, dest=peer, tag=HALO_TAG))
+                send_buffers.append(buf)
+                self.bytes_sent += buf.nbytes
+        wait_start = time.perf_counter()
+        MPI.Request.Waitall(requests)
+        self.wait_time += time.perf_counter() - wait_start
+        for buf, recv in received:
+            padded[self._padded(recv)] = buf
+
+    def update(self, forest):
+        """Copiar la región y rellenar sus celdas fantasma con el estado de los vecinos"""
+        d = self.depth
+        rows, cols = forest.shape
+        self.padded[d:d + rows, d:d + cols] = forest
+        return self.fill_ghosts(forest, self.padded)
+
+    def fill_ghosts(self, forest, padded):
+        """Rellenar las celdas fantasma de un arreglo ampliado cuyo interior ya es forest"""
+        if self.node_comm is None:
+            self._exchange_messages(forest, padded, remote_only=False)
+            return padded
+
+        for strip in self.shared_strips:
+            self.own_shared[strip] = forest[strip]
+        wait_start = time.perf_counter()
+        self.window.Fence()
+        self.wait_time += time.perf_counter() - wait_start
+        for peer, _, recv in self.plan:
+            if recv is not None and peer in self.shared_views:
+                p0, _, q0, _ = self.all_bounds[peer]
+                view = self.shared_views[peer]
+                padded[self._padded(recv)] = view[recv[0] - p0:recv[1] - p0, recv[2] - q0:recv[3] - q0]
+        # Solo los bordes con otros nodos viajan por la red
+        self._exchange_messages(forest, padded, remote_only=True)
+        wait_start = time.perf_counter()
+        self.window.Fence()
+        self.wait_time += time.perf_counter() - wait_start
+        return padded
+
+    def gather(self, forest, root=0):
+        """Reunir todas las regiones en el rank 0; con memoria compartida, un mensaje por nodo
+
+        Es la única copia completa de la región a la ventana en cada paso.
+        """
+        if self.node_comm is None:
+            self.bytes_sent += forest.nbytes
+            return self.comm.gather({'forest': forest, 'bounds': self.bounds}, root=root)
+
+        self.own_shared[...] = forest
+        self.window.Fence()
+        regions = None
+        if self.leader_comm != MPI.COMM_NULL:
+            regions = [{'forest': view.copy(), 'bounds': self.all_bounds[r]}
+                       for r, view in self.shared_views.items()]
+            self.bytes_sent += sum(region['forest'].nbytes for region in regions)
+        self.window.Fence()
+
+        if self.leader_comm == MPI.COMM_NULL:
+            return None
+        node_regions = self.leader_comm.gather(regions, root=root)
+        if node_regions is None:
+            return None
+        return [region for node in node_regions for region in node]
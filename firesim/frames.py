@@ -0,0 +1,87 @@
+import multiprocessing
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .colors import state_rgb_lut, frame_rgb, encode_ppm
+
+# Frames encolados como máximo antes de esperar al pool (acota la memoria)
+MAX_PENDING = 64
+
+
+def encode_png(rgb, level=6):
+    """Bytes de un PNG RGB de 8 bits escrito solo con zlib"""
+    height, width = rgb.shape[:2]
+    # Cada fila lleva delante el byte de filtro 0 (sin filtro)
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgb.reshape(height, width * 3)
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(raw.tobytes(), level)) + chunk(b'IEND', b''))
+
+
+def tile_bounds(rows, cols, tile):
+    """Esquinas (r0, r1, c0, c1) de los mosaicos de tile x tile celdas; uno solo si tile es 0"""
+    if not tile or (rows <= tile and cols <= tile):
+        return [(0, rows, 0, cols)]
+    return [(r0, min(r0 + tile, rows), c0, min(c0 + tile, cols))
+            for r0 in range(0, rows, tile) for c0 in range(0, cols, tile)]
+
+
+def write_frame(directory, step, frame, lut, fmt='png', scale=1, tile=0):
+    """Colorear un frame y escribirlo, en mosaicos si es más grande que ``tile`` celdas"""
+    encode = encode_png if fmt == 'png' else encode_ppm
+    tiles = tile_bounds(frame.shape[0], frame.shape[1], tile)
+    paths = []
+    for r0, r1, c0, c1 in tiles:
+        name = f"frame_{step:06d}.{fmt}" if len(tiles) == 1 else f"frame_{step:06d}_{r0}_{c0}.{fmt}"
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as f:
+            f.write(encode(frame_rgb(frame[r0:r1, c0:c1], lut, scale)))
+        paths.append(path)
+    return paths
+
+
+class FrameExporter:
+    """Exportar frames globales como imágenes en un pool de procesos, sin Tk
+
+    ``write`` solo copia el frame y lo encola; colorear, comprimir y escribir ocurre
+    en otros procesos. Se usa ``spawn`` para no bifurcar un proceso MPI.
+    """
+
+    def __init__(self, directory, num_processes, fmt='png', scale=1, tile=0, workers=2):
+        self.directory = directory
+        self.fmt = fmt
+        self.scale = scale
+        self.tile = tile
+        self.lut = state_rgb_lut(num_processes)
+        self.pending = []
+        os.makedirs(directory, exist_ok=True)
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def write(self, step, frame):
+        running = []
+        for future in self.pending:
+            if future.done():
+                # Propagar aquí un error de escritura
+                future.result()
+            else:
+                running.append(future)
+        self.pending = running
+        if len(self.pending) >= MAX_PENDING:
+            self.pending.pop(0).result()
+        self.pending.append(self.pool.submit(write_frame, self.directory, step, frame.copy(), self.lut,
+                                             self.fmt, self.scale, self.tile))
+
+    def close(self):
+        """Esperar las imágenes pendientes y cerrar el pool"""
+        for future in self.pending:
+            future.result()
+        self.pool.shutdown()
@@ -0,0 +1,237 @@
+import logging
+import threading
+import time
+import tkinter as tk
+
+import numpy as np
+
+from .colors import get_color_advanced, get_color_for_process
+from .config import (ROWS, COLS, STEPS, CELL_SIZE, EMPTY, TREE_YOUNG, TREE_MATURE, TREE_OLD,
+                     FIRE_LOW, FIRE_MEDIUM, FIRE_HIGH, BURNED, WATER)
+
+logger = logging.getLogger(__name__)
+
+
+class MasterFireApp:
+    def __init__(self, root, simulation, process_info):
+        self.root = root
+        self.simulation = simulation
+        size = simulation.size
+        self.root.title(f"Simulación de Incendios Forestales - MASTER ({size} procesos) - {simulation.hostname}")
+        self.root.configure(bg="#1a1a1a")
+        
+        
+        self.process_info = process_info
+        
+        
+        main_frame = tk.Frame(root, bg="#1a1a1a")
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        
+        left_panel = tk.Frame(main_frame, bg="#2d2d2d", relief=tk.RAISED, bd=2, width=280)
+        left_panel.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 10))
+        left_panel.pack_propagate(False)
+        
+        
+        title_label = tk.Label(left_panel, text="SIMULACIÓN MPI MASTER", bg="#2d2d2d", fg="#ff6600", 
+                             font=("Arial", 14, "bold"))
+        title_label.pack(pady=(10, 5))
+        
+        
+        cluster_info = tk.Label(left_panel, text=f"Cluster: {size} procesos", 
+                              bg="#2d2d2d", fg="#00ff00", font=("Arial", 11, "bold"))
+        cluster_info.pack(pady=2)
+        
+        
+        self.create_process_info_panel(left_panel)
+        
+        
+        separator = tk.Frame(left_panel, height=2, bg="#555555")
+        separator.pack(fill=tk.X, padx=10, pady=10)
+        
+        
+        legend_title = tk.Label(left_panel, text="LEYENDA", bg="#2d2d2d", fg="#ffffff", 
+                              font=("Arial", 12, "bold"))
+        legend_title.pack(pady=(5, 10))
+        
+        
+        self.create_legend(left_panel)
+        
+        
+        right_panel = tk.Frame(main_frame, bg="#1a1a1a")
+        right_panel.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        
+        
+        canvas_frame = tk.Frame(right_panel, bg="#1a1a1a", relief=tk.SUNKEN, bd=2)
+        canvas_frame.pack(fill=tk.BOTH, expand=True)
+        
+        canvas_title = tk.Label(canvas_frame, text="VISTA COMPLETA DEL BOSQUE", 
+                              bg="#1a1a1a", fg="#ffffff", font=("Arial", 12, "bold"))
+        canvas_title.pack(pady=5)
+        
+        self.canvas = tk.Canvas(canvas_frame, width=COLS*CELL_SIZE, height=ROWS*CELL_SIZE, 
+                              bg="#000000", highlightthickness=0)
+        self.canvas.pack()
+        
+        
+        self.full_forest = np.full((ROWS, COLS), TREE_MATURE, dtype=int)
+        
+        
+        self.rects = [[
+            self.canvas.create_rectangle(
+                j*CELL_SIZE, i*CELL_SIZE,
+                (j+1)*CELL_SIZE, (i+1)*CELL_SIZE,
+                fill=get_color_advanced(TREE_MATURE), outline="", width=0
+            ) for j in range(COLS)] for i in range(ROWS)]
+        
+        self.running = True
+        self.step = 0
+        
+        
+        control_frame = tk.Frame(right_panel, bg="#1a1a1a")
+        control_frame.pack(fill=tk.X, pady=5)
+        
+        self.step_label = tk.Label(control_frame, text="Paso: 0", bg="#1a1a1a", fg="#ffffff", 
+                                 font=("Arial", 12, "bold"))
+        self.step_label.pack(side=tk.LEFT, padx=10)
+        
+        
+        self.stats_label = tk.Label(control_frame, text="Fuegos: 0 | Quemados: 0", 
+                                  bg="#1a1a1a", fg="#ffff00", font=("Arial", 10))
+        self.stats_label.pack(side=tk.LEFT, padx=20)
+        
+        pause_btn = tk.Button(control_frame, text="⏸Pausar", command=self.toggle_pause,
+                            bg="#ff6600", fg="white", font=("Arial", 10, "bold"))
+        pause_btn.pack(side=tk.RIGHT, padx=5)
+        
+        logger.info("GUI Master inicializada, comenzando simulación")
+        threading.Thread(target=self.simulation_loop, daemon=True).start()
+    
+    def create_process_info_panel(self, parent):
+        
+        info_title = tk.Label(parent, text="PROCESOS Y COLORES", bg="#2d2d2d", fg="#ffffff", 
+                             font=("Arial", 11, "bold"))
+        info_title.pack(pady=(10, 10))
+        
+        
+        info_frame = tk.Frame(parent, bg="#2d2d2d")
+        info_frame.pack(fill=tk.X, padx=5)
+        
+        for i, info in enumerate(self.process_info):
+            process_color = get_color_for_process(info['rank'])
+            
+            
+            process_frame = tk.Frame(info_frame, bg="#404040", relief=tk.RAISED, bd=1)
+            process_frame.pack(fill=tk.X, pady=2)
+            
+            
+            color_frame = tk.Frame(process_frame, bg="#404040")
+            color_frame.pack(fill=tk.X, padx=5, pady=2)
+            
+            color_box = tk.Label(color_frame, text="  ", bg=process_color, 
+                               width=3, relief=tk.RAISED, bd=1)
+            color_box.pack(side=tk.LEFT, padx=(0, 5))
+            
+            tk.Label(color_frame, text=f"Proceso {info['rank']}", 
+                    bg="#404040", fg="#ffffff", font=("Arial", 9, "bold")).pack(side=tk.LEFT)
+            
+            tk.Label(process_frame, text=f" {info['hostname'][:12]}", 
+                    bg="#404040", fg="#cccccc", font=("Arial", 8)).pack(anchor="w", padx=10)
+    
+    def create_legend(self, parent):
+        legend_items = [
+            (TREE_YOUNG, "Árbol Joven"),
+            (TREE_MATURE, "Árbol Maduro"),
+            (TREE_OLD, "Árbol Viejo"),
+            (BURNED, "Quemado"),
+            (EMPTY, "Tierra"),
+            (WATER, "Agua")
+        ]
+        if self.simulation.model.initial_fire_states:
+            legend_items[3:3] = [
+                (FIRE_LOW, "Fuego Bajo"),
+                (FIRE_MEDIUM, "Fuego Medio"),
+                (FIRE_HIGH, "Fuego Alto")
+            ]
+        
+        for state, label in legend_items:
+            item_frame = tk.Frame(parent, bg="#2d2d2d")
+            item_frame.pack(fill=tk.X, padx=10, pady=1)
+            
+            color_box = tk.Label(item_frame, text="  ", bg=get_color_advanced(state), 
+                               width=3, relief=tk.RAISED, bd=1)
+            color_box.pack(side=tk.LEFT, padx=(0, 5))
+            
+            label_text = tk.Label(item_frame, text=label, bg="#2d2d2d", fg="#ffffff", 
+                                font=("Arial", 9), anchor="w")
+            label_text.pack(side=tk.LEFT, fill=tk.X, expand=True)
+    
+    def toggle_pause(self):
+        self.running = not self.running
+    
+    def simulation_loop(self):
+        """Bucle principal de simulación del master"""
+        sim = self.simulation
+        
+        while self.step < STEPS:
+            if not self.running:
+                time.sleep(0.1)
+                continue
+            
+            try:
+                
+                sim.comm.bcast(True, root=0)
+                
+                
+                sim.advance(self.step)
+                
+                
+                all_regions = sim.gather()
+                sim.publish_frame(self.step, all_regions)
+                sim.report_metrics(self.step)
+                
+                if all_regions:
+                    
+                    for region_data in all_regions:
+                        region_forest = region_data['forest']
+                        r_start, r_end, c_start, c_end = region_data['bounds']
+                        
+                        self.full_forest[r_start:r_end, c_start:c_end] = region_forest
+                    
+                    
+                    self.update_visualization(self.full_forest)
+                    
+                    
+                    self.step_label.config(text=f"Paso: {self.step}")
+                    
+                    self.step += 1
+                
+                time.sleep(0.1)  
+                
+            except Exception as e:
+                logger.error(f"Error en simulación master: {e}")
+                print(f"[Rank {sim.rank}] Error en simulación: {e}")
+                break
+        
+        
+        try:
+            sim.comm.bcast(False, root=0)
+        except:
+            pass
+        print("Simulación Master completada")
+    
+    def update_visualization(self, forest_data):
+        """Actualizar la visualización del canvas completo"""
+        fire_count = int(np.count_nonzero(self.simulation.model.is_fire(forest_data)))
+        burned_count = int(np.count_nonzero(forest_data == BURNED))
+        
+        for i in range(min(ROWS, forest_data.shape[0])):
+            for j in range(min(COLS, forest_data.shape[1])):
+                color = get_color_advanced(forest_data[i, j])
+                self.canvas.itemconfig(self.rects[i][j], fill=color)
+        
+        
+        self.stats_label.config(text=f"Fuegos: {fire_count} | Quemados: {burned_count}")
+        
+        
+        self.root.update_idletasks()
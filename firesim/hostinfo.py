@@ -0,0 +1,100 @@
+import datetime
+import platform
+import socket
+import sys
+import threading
+
+
+def get_detailed_host_info(rank, size, cpu_interval=1):
+    """Obtener información detallada del sistema"""
+    hostname = socket.gethostname()
+    try:
+        ip = socket.gethostbyname(hostname)
+    except:
+        ip = "Unknown"
+    
+    os_info = f"{platform.system()} {platform.release()}"
+    
+    try:
+        import psutil
+        cpu_count = psutil.cpu_count()
+        memory = psutil.virtual_memory()
+        memory_gb = round(memory.total / (1024**3), 2)
+        cpu_percent = psutil.cpu_percent(interval=cpu_interval)
+    except ImportError:
+        cpu_count = "N/A"
+        memory_gb = "N/A" 
+        cpu_percent = "N/A"
+    
+    return {
+        'hostname': hostname,
+        'ip': ip,
+        'os': os_info,
+        'cpu_cores': cpu_count,
+        'memory_gb': memory_gb,
+        'cpu_usage': cpu_percent,
+        'rank': rank,
+        'total_processes': size,
+        'timestamp': datetime.datetime.now().strftime("%H:%M:%S")
+    }
+
+
+def start_host_info_probe(rank, size, startup_t0):
+    """Recolectar la información del host en un hilo, sin bloquear el arranque"""
+    probe = {'info': None, 'launch': None}
+
+    def collect():
+        try:
+            import psutil
+            probe['launch'] = startup_t0 - psutil.Process().create_time()
+        except ImportError:
+            pass
+        # Sin intervalo: el uso de CPU se mide hasta finish_host_info_probe
+        probe['info'] = get_detailed_host_info(rank, size, cpu_interval=None)
+
+    probe['thread'] = threading.Thread(target=collect, name="host-info", daemon=True)
+    probe['thread'].start()
+    return probe
+
+
+def finish_host_info_probe(probe):
+    """Esperar al hilo de información del host y cerrar la medición de CPU"""
+    probe['thread'].join()
+    info = probe['info']
+    try:
+        import psutil
+        info['cpu_usage'] = psutil.cpu_percent(interval=None)
+    except ImportError:
+        pass
+    return info
+
+
+def report_startup_times(all_times):
+    """Mostrar el desglose del tiempo de arranque de cada proceso"""
+    print("\nTIEMPOS DE ARRANQUE POR PROCESO (s):")
+    print(f"  {'Rank':>4} {'Lanzamiento':>12} {'MPI':>6} {'Terreno':>8} {'Info host':>10} {'Allgather':>10} {'Total':>7}")
+    for proc_rank, times in enumerate(all_times):
+        launch = times['launch']
+        launch_text = f"{launch:12.3f}" if launch is not None else f"{'N/A':>12}"
+        print(f"  {proc_rank:>4} {launch_text} {times['mpi_init']:6.3f} {times['terrain']:8.3f} {times['host_info']:10.3f} "
+              f"{times['allgather']:10.3f} {times['total']:7.3f}")
+
+
+def peak_rss_mb():
+    """Pico de memoria residente del proceso en MB (None si no se puede medir)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa en KB y macOS en bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def current_rss_mb():
+    """Memoria residente actual en MB; sin psutil, el pico"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        return peak_rss_mb()
@@ -0,0 +1,240 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .config import BURNED, ASH, FIRE_BASE, default_fire_params
+from .engine import StepWorkspace, climate_factor, compiled_process_model
+
+logger = logging.getLogger(__name__)
+
+# Tamaño de tramo para todo el conjunto de trabajo (estado, terreno, clima y auxiliares,
+# unos 112 bytes por celda). Cada pasada de NumPy toca solo unos pocos de esos arreglos,
+# así que 4 MiB mantiene cada pasada dentro de una L2 de 1-2 MiB
+CACHE_BLOCK_BYTES = 1 << 22
+BYTES_PER_CELL = 112
+
+
+def cache_block_rows(cols):
+    """Filas por bloque para que el paso de un bloque no salga de la caché"""
+    return max(8, CACHE_BLOCK_BYTES // (BYTES_PER_CELL * max(1, cols)))
+
+
+_tile_executor = None
+
+
+def get_tile_executor(threads):
+    """Pool de hilos persistente para los bloques de la región"""
+    global _tile_executor
+    if _tile_executor is None or _tile_executor._max_workers != threads:
+        if _tile_executor is not None:
+            _tile_executor.shutdown()
+        _tile_executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="tile")
+    return _tile_executor
+
+
+class StateBuffers:
+    """Dos estados ampliados con celdas fantasma que se alternan en cada paso
+
+    El paso lee del estado actual y escribe en el otro, así que no se copia ni se
+    reserva memoria por paso. Cada hilo recorre su bloque en tramos de ``block_rows``
+    filas (0: el bloque entero) y sus auxiliares tienen el tamaño de un tramo.
+    """
+
+    def __init__(self, forest, elevation, humidity, temperature, threads=1, padded_elevation=None,
+                 block_rows=None):
+        rows, cols = forest.shape
+        # El borde queda en -1 (fuera de la malla) salvo que un intercambio lo rellene
+        self.states = [np.full((rows + 2, cols + 2), -1, dtype=forest.dtype) for _ in range(2)]
+        self.views = [state[1:rows + 1, 1:cols + 1] for state in self.states]
+        self.current = 0
+        self.views[0][...] = forest
+
+        if padded_elevation is None:
+            padded_elevation = np.pad(elevation, 1, mode='edge')
+        self.padded_elevation = padded_elevation
+        self.humidity = humidity
+        self.temperature = temperature
+        self.climate = np.empty(forest.shape)
+        self.climate_key = None
+
+        num_tiles = max(1, min(threads, rows))
+        self.edges = np.linspace(0, rows, num_tiles + 1).astype(int)
+        tile_rows = max(1, max(np.diff(self.edges)))
+        if block_rows is None:
+            block_rows = cache_block_rows(cols)
+        self.block_rows = min(block_rows, tile_rows) if block_rows > 0 else tile_rows
+        self.workspaces = [StepWorkspace((min(self.block_rows, self.edges[t + 1] - self.edges[t]), cols))
+                           for t in range(num_tiles)]
+
+    @property
+    def forest(self):
+        """Vista del estado actual sin las celdas fantasma"""
+        return self.views[self.current]
+
+    @property
+    def padded(self):
+        return self.states[self.current]
+
+    def load(self, forest):
+        """Copiar un estado externo al búfer actual (no hace nada si ya es el suyo)"""
+        if forest is not self.forest:
+            self.forest[...] = forest
+        return self.forest
+
+    def climate_factor(self, params):
+        """Factor de humedad y temperatura, recalculado solo si cambia humidity_base"""
+        key = params['humidity_base']
+        if key != self.climate_key:
+            climate_factor(self.humidity, self.temperature, params, out=self.climate)
+            self.climate_key = key
+        return self.climate
+
+    def swap(self):
+        self.current = 1 - self.current
+
+    def nbytes(self):
+        """Memoria reservada por los búferes y los auxiliares"""
+        total = sum(state.nbytes for state in self.states) + self.climate.nbytes
+        for work in self.workspaces:
+            total += sum(array.nbytes for array in vars(work).values())
+        return total
+
+
+def spread_tile(model, buffers, tile, fire_state, params, rng, wind=None):
+    """Kernel sobre las filas del bloque ``tile``, escrito directamente en el búfer siguiente
+
+    Vecinos, números aleatorios y nuevo estado se calculan tramo a tramo, así cada tramo
+    se lee de memoria una vez y el resto de las pasadas caen en la caché.
+    """
+    row_start, row_end = buffers.edges[tile], buffers.edges[tile + 1]
+    work = buffers.workspaces[tile]
+    height = work.index.shape[0]
+    cols = buffers.forest.shape[1]
+    next_state = buffers.states[1 - buffers.current]
+    fires_spread = fires_extinguished = 0
+    for r0 in range(row_start, row_end, height):
+        r1 = min(r0 + height, row_end)
+        block_work = work if r1 - r0 == height else work.rows(r1 - r0)
+        # Llenar el tramo en orden de filas deja la misma secuencia que un solo llenado del bloque
+        rng.random(out=block_work.draw)
+        # Los bordes del tramo se leen del estado actual, nunca del siguiente
+        _, spread, extinguished = model.step_window(
+            buffers.padded, buffers.padded_elevation, slice(r0 + 1, r1 + 1), slice(1, cols + 1),
+            buffers.humidity[r0:r1], buffers.temperature[r0:r1], block_work.draw, params,
+            fire_state, out=next_state[r0 + 1:r1 + 1, 1:cols + 1], work=block_work,
+            climate=buffers.climate[r0:r1], wind=None if wind is None else wind[:, r0:r1])
+        fires_spread += spread
+        fires_extinguished += extinguished
+    return fires_spread, fires_extinguished
+
+
+def spread_process_fire(forest, elevation, humidity, temperature, process_rank, step, params=None,
+                        threads=1, buffers=None, model=None, wind=None):
+    """Propagación de fuego de un proceso, repartida en bloques horizontales entre hilos
+
+    Con ``buffers`` el resultado es una vista del búfer actual, válida hasta el siguiente paso.
+    ``wind`` son los factores de viento por dirección de la región (ver firesim.wind).
+    """
+    if params is None:
+        params = default_fire_params()
+    if model is None:
+        model = compiled_process_model(process_rank + 1)
+    fire_state = FIRE_BASE + process_rank
+
+    if buffers is None:
+        buffers = StateBuffers(forest, elevation, humidity, temperature, threads)
+    else:
+        buffers.load(forest)
+    buffers.climate_factor(params)
+
+    num_tiles = len(buffers.workspaces)
+    # Un flujo aleatorio independiente por bloque, derivado del generador global
+    streams = np.random.SeedSequence(np.random.randint(2**31)).spawn(num_tiles)
+
+    tile_args = [(model, buffers, t, fire_state, params, np.random.default_rng(streams[t]), wind)
+                 for t in range(num_tiles)]
+
+    if num_tiles == 1:
+        counts = [spread_tile(*tile_args[0])]
+    else:
+        executor = get_tile_executor(threads)
+        counts = list(executor.map(lambda a: spread_tile(*a), tile_args))
+    buffers.swap()
+
+    fires_spread = sum(c[0] for c in counts)
+    fires_extinguished = sum(c[1] for c in counts)
+    if fires_extinguished > 0 or fires_spread > 0:
+        logger.info("Proceso %d, Paso %d: %d nuevos fuegos, %d extinguidos", process_rank, step,
+                    fires_spread, fires_extinguished, extra={'step': step})
+
+    return buffers.forest
+
+
+HASH_MULTIPLIERS = (0x9E3779B97F4A7C15, 0xBF58476D1CE4E5B9, 0x94D049BB133111EB, 0xD6E8FEB86659FD93)
+
+
+def cell_uniforms(seed, step, global_rows, global_cols):
+    """Uniformes en [0, 1) que solo dependen de la semilla, el paso y la celda global"""
+    key = (seed * HASH_MULTIPLIERS[3] + step * HASH_MULTIPLIERS[0]) % 2**64
+    with np.errstate(over='ignore'):
+        x = (np.asarray(global_rows, dtype=np.uint64)[:, None] * np.uint64(HASH_MULTIPLIERS[1])
+             + np.asarray(global_cols, dtype=np.uint64)[None, :] * np.uint64(HASH_MULTIPLIERS[2])
+             + np.uint64(key))
+        # Finalizador splitmix64
+        x ^= x >> np.uint64(30)
+        x *= np.uint64(HASH_MULTIPLIERS[1])
+        x ^= x >> np.uint64(27)
+        x *= np.uint64(HASH_MULTIPLIERS[2])
+        x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) * (1.0 / 2**53)
+
+
+def spread_temporal_block(exchange, forest, step, seed, params=None, model=None, wind=None):
+    """Un paso del bloque temporal: halo de K celdas intercambiado cada K pasos
+
+    ``wind`` son los factores de viento de la región ampliada por el halo.
+    """
+    if params is None:
+        params = default_fire_params()
+    if model is None:
+        model = compiled_process_model(len(exchange.all_bounds))
+    d = exchange.depth
+    if exchange.block_state is None or exchange.block_substep >= d:
+        exchange.block_state = exchange.update(forest).copy()
+        exchange.block_substep = 0
+
+    state = exchange.block_state
+    height, width = state.shape
+    # En cada subpaso la zona válida se reduce una celda por lado
+    m = exchange.block_substep + 1
+    center = (slice(m, height - m), slice(m, width - m))
+
+    # El dueño de cada celda y su vecino calculan exactamente el mismo número aleatorio
+    r0, _, c0, _ = exchange.bounds
+    draw = cell_uniforms(seed, step,
+                         np.arange(r0 - d + m, r0 - d + height - m),
+                         np.arange(c0 - d + m, c0 - d + width - m))
+
+    new_cell, _, _ = model.step_window(state, exchange.padded_elevation, center[0], center[1],
+                                       exchange.padded_humidity[center], exchange.padded_temperature[center],
+                                       draw, params, exchange.owner_state[center],
+                                       wind=None if wind is None else wind[(slice(None),) + center])
+    state[center] = new_cell
+    exchange.block_substep += 1
+
+    rows, cols = forest.shape
+    new_forest = state[d:d + rows, d:d + cols].copy()
+    was_fire = model.is_fire(forest)
+    now_fire = model.is_fire(new_forest)
+    fires_spread = int(np.count_nonzero(now_fire & ~was_fire))
+    fires_extinguished = int(np.count_nonzero(was_fire & ~now_fire))
+    if fires_extinguished > 0 or fires_spread > 0:
+        logger.info("Proceso %d, Paso %d: %d nuevos fuegos, %d extinguidos", exchange.rank, step,
+                    fires_spread, fires_extinguished, extra={'step': step})
+    return new_forest
+
+
+def affected_cells(forest):
+    """Máscara de celdas alcanzadas por el fuego"""
+    return (forest >= FIRE_BASE) | (forest == BURNED) | (forest == ASH)
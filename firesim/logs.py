@@ -0,0 +1,109 @@
+import atexit
+import heapq
+import logging
+import logging.handlers
+import queue
+import re
+
+LOG_FORMAT = '%(asctime)s - Rank %(rank)d - %(hostname)s - %(message)s'
+# Las líneas que empiezan con la fecha de asctime abren un registro nuevo
+RECORD_START = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} ')
+
+
+class RankContextFilter(logging.Filter):
+    """Agregar rank y hostname a cada registro del log"""
+
+    def __init__(self, rank, hostname):
+        super().__init__()
+        self.rank = rank
+        self.hostname = hostname
+
+    def filter(self, record):
+        record.rank = self.rank
+        record.hostname = self.hostname
+        return True
+
+
+class StepSampleFilter(logging.Filter):
+    """Dejar pasar solo uno de cada ``every`` pasos de los registros con ``extra={'step': ...}``"""
+
+    def __init__(self, every):
+        super().__init__()
+        self.every = max(1, every)
+
+    def filter(self, record):
+        step = getattr(record, 'step', None)
+        return step is None or step % self.every == 0
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """Encolar el registro tal cual; el mensaje se arma en el hilo del QueueListener"""
+
+    def prepare(self, record):
+        # La cola no sale del proceso: no hace falta formatear ni copiar el registro
+        return record
+
+
+def log_path(rank, hostname):
+    return f'mpi_log_rank_{rank}_{hostname}.log'
+
+
+def configure_logging(rank, hostname, sample_every=1):
+    """Log individual por proceso, escrito por un hilo aparte a través de una cola
+
+    El paso de simulación solo encola el registro; el formato y la escritura en disco
+    ocurren en el QueueListener. Devuelve el listener para detenerlo al terminar.
+    """
+    file_handler = logging.FileHandler(log_path(rank, hostname), mode='w')
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = RecordQueueHandler(log_queue)
+    queue_handler.addFilter(StepSampleFilter(sample_every))
+    queue_handler.addFilter(RankContextFilter(rank, hostname))
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(logging.INFO)
+
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(stop_logging, listener)
+    return listener
+
+
+def stop_logging(listener):
+    """Vaciar la cola y cerrar el archivo de log (se puede llamar más de una vez)"""
+    if listener._thread is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+def read_records(path):
+    """Registros de un archivo de log; las líneas de continuación quedan con su registro"""
+    records = []
+    with open(path) as f:
+        for line in f:
+            if RECORD_START.match(line) or not records:
+                records.append(line)
+            else:
+                records[-1] += line
+    return records
+
+
+def merge_logs(comm, listener, rank, hostname, output='mpi_log_merged.log'):
+    """Reunir los logs de todos los procesos en rank 0 en un solo archivo ordenado por tiempo"""
+    stop_logging(listener)
+    records = read_records(log_path(rank, hostname))
+    all_records = comm.gather(records, root=0)
+    if rank != 0:
+        return None
+    # Cada log ya está en orden: basta una mezcla por la fecha inicial
+    merged = heapq.merge(*all_records, key=lambda record: record[:23])
+    with open(output, 'w') as f:
+        f.writelines(merged)
+    print(f"[Rank {rank}] Logs combinados en {output}")
+    return output
@@ -0,0 +1,94 @@
+import json
+import os
+import time
+
+import numpy as np
+
+from .config import BURNED, ASH
+from .hostinfo import current_rss_mb
+
+
+def state_counts(forest, model):
+    """Celdas en llamas, quemadas y en ceniza de un bosque denso"""
+    return {
+        'fires': int(np.count_nonzero(model.is_fire(forest))),
+        'burned': int(np.count_nonzero(forest == BURNED)),
+        'ash': int(np.count_nonzero(forest == ASH)),
+    }
+
+
+class RankMetrics:
+    """Tiempos de cálculo y espera de un proceso acumulados entre dos reportes"""
+
+    def __init__(self):
+        self.compute_time = 0.0
+        self.wait_time = 0.0
+        self.bytes_sent = 0
+        self.steps = 0
+
+    def snapshot(self, rank, counts):
+        """Métricas locales desde el último reporte; reinicia los acumulados
+
+        ``counts`` son las celdas por estado de la región (ver ``state_counts``).
+        """
+        stats = {
+            'rank': rank,
+            'steps': self.steps,
+            'compute_s': round(self.compute_time, 6),
+            'wait_s': round(self.wait_time, 6),
+            'bytes_sent': self.bytes_sent,
+            'rss_mb': round(current_rss_mb() or 0.0, 1),
+            **counts,
+        }
+        self.__init__()
+        return stats
+
+
+class MetricsWriter:
+    """Archivo de métricas del rank 0: una línea JSON por reporte o texto de Prometheus"""
+
+    def __init__(self, path, fmt='jsonl'):
+        self.path = path
+        self.fmt = fmt
+        self.last_time = time.time()
+        if fmt == 'jsonl':
+            open(path, 'w').close()
+
+    def write(self, step, all_stats):
+        now = time.time()
+        elapsed = now - self.last_time
+        self.last_time = now
+        steps = max(s['steps'] for s in all_stats)
+        record = {
+            'time': round(now, 3),
+            'step': step,
+            'steps_per_s': round(steps / elapsed, 3) if elapsed > 0 else None,
+            'fires': sum(s['fires'] for s in all_stats),
+            'burned': sum(s['burned'] for s in all_stats),
+            'ash': sum(s['ash'] for s in all_stats),
+            'bytes_sent': sum(s['bytes_sent'] for s in all_stats),
+            'ranks': all_stats,
+        }
+        if self.fmt == 'prometheus':
+            self._write_prometheus(record)
+        else:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        return record
+
+    def _write_prometheus(self, record):
+        lines = []
+        for name, value in (('step', record['step']), ('steps_per_second', record['steps_per_s'] or 0),
+                            ('fires', record['fires']), ('burned_cells', record['burned']),
+                            ('ash_cells', record['ash'])):
+            lines.append(f"# TYPE firesim_{name} gauge")
+            lines.append(f"firesim_{name} {value}")
+        for name, key in (('compute_seconds', 'compute_s'), ('wait_seconds', 'wait_s'),
+                          ('bytes_sent', 'bytes_sent'), ('rss_megabytes', 'rss_mb')):
+            lines.append(f"# TYPE firesim_rank_{name} gauge")
+            lines.extend(f'firesim_rank_{name}{{rank="{s["rank"]}"}} {s[key]}' for s in record['ranks'])
+        # Reemplazo atómico: quien lea el archivo nunca ve un reporte a medias
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, self.path)
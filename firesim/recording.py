@@ -0,0 +1,67 @@
+import json
+import os
+
+import numpy as np
+
+FRAME_DTYPE = np.int16
+
+
+STEP_DTYPE = np.dtype('<i8')
+
+
+def header_path(path):
+    return f"{path}.json"
+
+
+def steps_path(path):
+    return f"{path}.steps"
+
+
+class TrajectoryWriter:
+    """Grabación de frames globales: datos crudos en ``path``, cabecera JSON e índice de pasos al lado
+
+    La cabecera se escribe una sola vez; por cada frame se agrega al índice un registro de
+    tamaño fijo con su paso, así una grabación a medias ya se puede reproducir.
+    """
+
+    def __init__(self, path, shape, num_processes):
+        self.path = path
+        self.header = {'rows': shape[0], 'cols': shape[1], 'dtype': np.dtype(FRAME_DTYPE).str,
+                       'num_processes': num_processes}
+        self.file = open(path, 'wb')
+        self.steps_file = open(steps_path(path), 'wb')
+        tmp_path = f"{header_path(path)}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.header, f)
+        os.replace(tmp_path, header_path(path))
+
+    def write(self, step, frame):
+        # El frame va antes que su paso: el índice nunca apunta a un frame incompleto
+        self.file.write(np.ascontiguousarray(frame, dtype=FRAME_DTYPE).tobytes())
+        self.file.flush()
+        self.steps_file.write(np.array([step], dtype=STEP_DTYPE).tobytes())
+        self.steps_file.flush()
+
+    def close(self):
+        self.file.close()
+        self.steps_file.close()
+
+
+class Trajectory:
+    """Grabación abierta con memmap: cada frame se lee del disco solo cuando se pide"""
+
+    def __init__(self, path):
+        with open(header_path(path)) as f:
+            self.header = json.load(f)
+        self.steps = np.fromfile(steps_path(path), dtype=STEP_DTYPE).tolist()
+        self.num_processes = self.header['num_processes']
+        shape = (len(self.steps), self.header['rows'], self.header['cols'])
+        dtype = np.dtype(self.header['dtype'])
+        # memmap no admite archivos vacíos
+        self.frames = np.memmap(path, dtype=dtype, mode='r', shape=shape) if self.steps else np.empty(shape, dtype)
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __getitem__(self, index):
+        return self.frames[index]
@@ -0,0 +1,169 @@
+import argparse
+import threading
+import tkinter as tk
+
+import numpy as np
+
+from .colors import state_rgb_lut, frame_rgb, encode_ppm
+from .config import CELL_SIZE, FIRE_LOW, FIRE_HIGH, FIRE_BASE, BURNED
+from .recording import Trajectory
+
+BASE_FPS = 10
+MIN_INTERVAL_MS = 20
+PREFETCH_FRAMES = 32
+SPEEDS = ['0.25', '0.5', '1', '2', '4', '8', '16', '32']
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Reproducir una grabación de --record sin MPI")
+    parser.add_argument('path', help="Archivo de frames grabado con --record")
+    parser.add_argument('--speed', choices=SPEEDS, default='1',
+                        help=f"Velocidad inicial (1 = {BASE_FPS} frames por segundo)")
+    parser.add_argument('--start', type=int, default=0, help="Frame inicial")
+    parser.add_argument('--cell-size', type=int, default=CELL_SIZE, help="Píxeles por celda")
+    return parser.parse_args(argv)
+
+
+class FramePrefetcher:
+    """Prepara en un hilo las imágenes de los próximos frames en el sentido de reproducción"""
+
+    def __init__(self, trajectory, lut, scale, ahead=PREFETCH_FRAMES):
+        self.trajectory = trajectory
+        self.lut = lut
+        self.scale = scale
+        self.ahead = ahead
+        self.cache = {}
+        self.lock = threading.Lock()
+        self.wanted = threading.Event()
+        self.position = 0
+        self.stride = 1
+        threading.Thread(target=self._run, name='prefetch', daemon=True).start()
+
+    def render(self, index):
+        return encode_ppm(frame_rgb(self.trajectory[index], self.lut, self.scale))
+
+    def get(self, index, stride=1):
+        """Imagen PPM del frame; si no estaba preparada se genera ahora"""
+        with self.lock:
+            data = self.cache.get(index)
+            self.position, self.stride = index, stride
+        self.wanted.set()
+        if data is None:
+            data = self.render(index)
+        return data
+
+    def _run(self):
+        while True:
+            self.wanted.wait()
+            self.wanted.clear()
+            with self.lock:
+                window = [self.position + k * self.stride for k in range(1, self.ahead + 1)]
+                window = [index for index in window if 0 <= index < len(self.trajectory)]
+                keep = set(window)
+                self.cache = {index: data for index, data in self.cache.items() if index in keep}
+            for index in window:
+                # Un salto o cambio de velocidad reinicia la ventana
+                if self.wanted.is_set():
+                    break
+                if index in self.cache:
+                    continue
+                data = self.render(index)
+                with self.lock:
+                    self.cache[index] = data
+
+
+class ReplayApp:
+    def __init__(self, root, trajectory, speed='1', start=0, cell_size=CELL_SIZE):
+        self.root = root
+        self.trajectory = trajectory
+        self.index = min(max(0, start), len(trajectory) - 1)
+        self.playing = False
+        self.prefetcher = FramePrefetcher(trajectory, state_rgb_lut(trajectory.num_processes), cell_size)
+        self.root.title(f"Reproducción - {len(trajectory)} frames")
+        self.root.configure(bg="#1a1a1a")
+
+        rows, cols = trajectory.frames.shape[1:]
+        self.canvas = tk.Canvas(root, width=cols * cell_size, height=rows * cell_size,
+                                bg="#000000", highlightthickness=0)
+        self.canvas.pack(padx=10, pady=10)
+        self.image = None
+        self.image_item = self.canvas.create_image(0, 0, anchor=tk.NW)
+
+        self.seek = tk.Scale(root, from_=0, to=len(trajectory) - 1, orient=tk.HORIZONTAL, showvalue=False,
+                             command=lambda value: self.show(int(value)), bg="#1a1a1a", fg="#ffffff",
+                             highlightthickness=0)
+        self.seek.pack(fill=tk.X, padx=10)
+
+        control_frame = tk.Frame(root, bg="#1a1a1a")
+        control_frame.pack(fill=tk.X, pady=5)
+        self.step_label = tk.Label(control_frame, text="", bg="#1a1a1a", fg="#ffffff", font=("Arial", 12, "bold"))
+        self.step_label.pack(side=tk.LEFT, padx=10)
+        self.stats_label = tk.Label(control_frame, text="", bg="#1a1a1a", fg="#ffff00", font=("Arial", 10))
+        self.stats_label.pack(side=tk.LEFT, padx=20)
+
+        self.speed = tk.StringVar(value=speed)
+        tk.OptionMenu(control_frame, self.speed, *SPEEDS).pack(side=tk.RIGHT, padx=5)
+        tk.Label(control_frame, text="Velocidad x", bg="#1a1a1a", fg="#ffffff").pack(side=tk.RIGHT)
+        for text, command in (("▶|", lambda: self.show(self.index + 1)), ("Reproducir/Pausar", self.toggle_play),
+                              ("|◀", lambda: self.show(self.index - 1)), ("⏮", lambda: self.show(0))):
+            tk.Button(control_frame, text=text, command=command, bg="#ff6600", fg="white",
+                      font=("Arial", 10, "bold")).pack(side=tk.RIGHT, padx=2)
+
+        root.bind('<space>', lambda event: self.toggle_play())
+        root.bind('<Right>', lambda event: self.show(self.index + 1))
+        root.bind('<Left>', lambda event: self.show(self.index - 1))
+        root.bind('<Home>', lambda event: self.show(0))
+        root.bind('<End>', lambda event: self.show(len(self.trajectory) - 1))
+        self.show(self.index)
+
+    def playback(self):
+        """Intervalo entre frames y frames que se avanzan; a alta velocidad se saltan frames"""
+        interval = 1000.0 / (BASE_FPS * float(self.speed.get()))
+        stride = max(1, round(MIN_INTERVAL_MS / interval))
+        return max(MIN_INTERVAL_MS, int(interval * stride)), stride
+
+    def show(self, index):
+        index = min(max(0, index), len(self.trajectory) - 1)
+        self.index = index
+        _, stride = self.playback()
+        self.image = tk.PhotoImage(data=self.prefetcher.get(index, stride if self.playing else 1), format='PPM')
+        self.canvas.itemconfig(self.image_item, image=self.image)
+
+        frame = self.trajectory[index]
+        fires = np.count_nonzero(((frame >= FIRE_LOW) & (frame <= FIRE_HIGH)) | (frame >= FIRE_BASE))
+        self.step_label.config(text=f"Paso: {self.trajectory.steps[index]} ({index + 1}/{len(self.trajectory)})")
+        self.stats_label.config(text=f"Fuegos: {fires} | Quemados: {np.count_nonzero(frame == BURNED)}")
+        if self.seek.get() != index:
+            self.seek.set(index)
+
+    def toggle_play(self):
+        self.playing = not self.playing
+        if self.playing:
+            if self.index >= len(self.trajectory) - 1:
+                self.show(0)
+            self.tick()
+
+    def tick(self):
+        if not self.playing:
+            return
+        interval, stride = self.playback()
+        if self.index >= len(self.trajectory) - 1:
+            self.playing = False
+            return
+        self.show(self.index + stride)
+        self.root.after(interval, self.tick)
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    trajectory = Trajectory(args.path)
+    if len(trajectory) == 0:
+        print(f"La grabación {args.path} no tiene frames")
+        return
+    root = tk.Tk()
+    ReplayApp(root, trajectory, args.speed, args.start, args.cell_size)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
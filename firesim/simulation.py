@@ -0,0 +1,442 @@
+import logging
+import socket
+import time
+
+import numpy as np
+
+from .cli import parse_arguments
+from .config import ROWS, COLS, FIRE_BASE, default_fire_params
+from .decomposition import get_region_bounds
+from .hostinfo import start_host_info_probe, finish_host_info_probe, report_startup_times
+from .logs import configure_logging, merge_logs, stop_logging
+from .engine import build_fire_model
+from .kernels import StateBuffers, spread_process_fire, spread_temporal_block
+from .terrain import generate_terrain, initialize_process_fires
+
+logger = logging.getLogger(__name__)
+
+
+def open_terrain_cache(args):
+    """Caché de terreno pedida en la línea de comandos, o None"""
+    if not args.terrain_cache:
+        return None
+    from .terrain_cache import TerrainCache
+    return TerrainCache(args.terrain_cache, args.terrain_cache_mb * 1024 * 1024)
+
+
+class Simulation:
+    """Estado de un proceso: su región del bosque, el terreno y el intercambio con vecinos"""
+
+    def __init__(self, comm, args, startup_t0, startup_times):
+        self.comm = comm
+        self.args = args
+        self.rank = comm.Get_rank()
+        self.size = comm.Get_size()
+        self.hostname = socket.gethostname()
+        rank = self.rank
+
+        host_probe = start_host_info_probe(rank, self.size, startup_t0)
+        self.model = build_fire_model(args.model, self.size)
+
+        self.bounds = get_region_bounds(rank, self.size, ROWS, COLS)
+        row_start, row_end, col_start, col_end = self.bounds
+        print(f"[Rank {rank}] Región asignada: filas {row_start}-{row_end}, columnas {col_start}-{col_end}")
+
+        print(f"[Rank {rank}] Generando datos iniciales...")
+
+        phase_start = time.time()
+        # Parámetros del modelo compartidos por todos los kernels; los eventos pueden cambiarlos
+        self.params = default_fire_params()
+        self.region = None
+        if args.compressed:
+            from .compressed import CompressedRegion
+            self.region = CompressedRegion(self.bounds, args.seed, self.model, rank, params=self.params,
+                                           block_size=args.block_size)
+            self.region.initialize_fires(self.model.initial_fire_states)
+            # La región densa solo se arma cuando el rank 0 necesita un frame (ver gather)
+            self.forest = None
+            self.elevation = self.humidity = self.temperature = None
+        else:
+            self.forest, self.elevation, self.humidity, self.temperature = generate_terrain(
+                args.terrain, args.seed, row_start, row_end, col_start, col_end, open_terrain_cache(args))
+            self.forest = initialize_process_fires(self.forest, rank, self.model.initial_fire_states)
+        startup_times['terrain'] = time.time() - phase_start
+
+        print(f"[Rank {rank}] Datos generados. Tamaño local: {(row_end - row_start, col_end - col_start)}")
+
+        print(f"[Rank {rank}] Sincronizando con otros procesos...")
+
+        phase_start = time.time()
+        my_info = finish_host_info_probe(host_probe)
+        startup_times['host_info'] = time.time() - phase_start
+        print(f"[Rank {rank}] Enviando información: {my_info['hostname']}")
+
+        # allgather ya sincroniza a todos los procesos: no hace falta una Barrier adicional
+        phase_start = time.time()
+        self.process_info = comm.allgather(my_info)
+        startup_times['allgather'] = time.time() - phase_start
+        startup_times['launch'] = host_probe['launch']
+        startup_times['total'] = time.time() - startup_t0
+        print(f"[Rank {rank}] Todos los procesos están sincronizados.")
+
+        logger.info(f"Tiempos de arranque: {startup_times}")
+        all_startup_times = comm.gather(startup_times, root=0)
+        if rank == 0:
+            report_startup_times(all_startup_times)
+
+        self.exchange = None
+        if args.halo or args.shared_memory:
+            from .exchange import RegionExchange
+            self.exchange = RegionExchange(comm, rank, self.size, self.forest, self.elevation,
+                                           depth=max(1, args.halo_depth), shared_memory=args.shared_memory,
+                                           humidity=self.humidity, temperature=self.temperature)
+            print(f"[Rank {rank}] Intercambio de regiones: {len(self.exchange.plan)} vecinos, "
+                  f"{len(self.exchange.shared_views)} procesos en el nodo")
+
+        self.metrics = None
+        if args.metrics:
+            from .metrics import RankMetrics, MetricsWriter
+            self.metrics = RankMetrics()
+            self.metrics_writer = MetricsWriter(args.metrics, args.metrics_format) if rank == 0 else None
+
+        self.watchdog = None
+        if args.watchdog:
+            from .watchdog import Watchdog
+            self.watchdog = Watchdog(comm, self.process_info, args.straggler_steps, args.straggler_factor,
+                                     args.straggler_seconds, args.abort_stragglers, args.checkpoint)
+
+        self.events = None
+        if args.events:
+            from .events import load_events, route_events
+            self.events = route_events(comm, load_events(args.events) if rank == 0 else None, ROWS, COLS)
+
+        self.wind = None
+        if args.wind:
+            from .wind import WindField, load_wind_schedule
+            self.wind = WindField(load_wind_schedule(args.wind), ROWS, COLS)
+
+        # Destinos de los frames globales del rank 0: (cada cuántos pasos, destino)
+        self.frame_sinks = []
+        self.frame = None
+        if rank == 0 and args.record:
+            from .recording import TrajectoryWriter
+            self.frame_sinks.append((max(1, args.record_every),
+                                     TrajectoryWriter(args.record, (ROWS, COLS), self.size)))
+        if rank == 0 and args.export_frames:
+            from .frames import FrameExporter
+            self.frame_sinks.append((max(1, args.export_every),
+                                     FrameExporter(args.export_frames, self.size, args.export_format,
+                                                   args.export_scale, args.export_tile, args.export_workers)))
+        if rank == 0 and args.stream:
+            from .stream import FrameStreamer
+            self.frame_sinks.append((max(1, args.stream_every), FrameStreamer(args.stream, (ROWS, COLS), self.size)))
+
+        self.step = None
+        self.buffers = None
+        if self.region is None and not (self.exchange is not None and args.halo and args.halo_depth > 0):
+            padded_elevation = self.exchange.padded_elevation if self.exchange is not None and args.halo else None
+            self.buffers = StateBuffers(self.forest, self.elevation, self.humidity, self.temperature,
+                                        max(1, args.threads), padded_elevation)
+            self.forest = self.buffers.forest
+
+    def advance(self, step):
+        """Avanzar la región local un paso, midiendo cálculo y espera si hay métricas o watchdog"""
+        self.step = step
+        self.apply_events(step)
+        if self.wind is not None:
+            self.wind.update(step, self.params)
+        if self.metrics is None and self.watchdog is None:
+            return self._advance(step)
+        start = time.perf_counter()
+        wait_before = self.exchange.wait_time if self.exchange is not None else 0.0
+        result = self._advance(step)
+        elapsed = time.perf_counter() - start
+        wait = (self.exchange.wait_time if self.exchange is not None else 0.0) - wait_before
+        if self.metrics is not None:
+            self.metrics.compute_time += elapsed - wait
+            self.metrics.wait_time += wait
+            self.metrics.steps += 1
+        if self.watchdog is not None:
+            # Solo el cálculo: los vecinos de un proceso lento también esperan en el intercambio
+            self.watchdog.beat(step, elapsed - wait)
+        return result
+
+    def _advance(self, step):
+        """Avanzar la región local un paso con el kernel seleccionado"""
+        args = self.args
+        if self.region is not None:
+            self.region.step(step, self.wind)
+            return None
+        if self.buffers is None:
+            wind = None
+            if self.wind is not None:
+                r0, r1, c0, c1 = self.bounds
+                d = self.exchange.depth
+                wind = self.wind.planes((r0 - d, r1 + d, c0 - d, c1 + d))
+            self.forest = spread_temporal_block(self.exchange, self.forest, step, args.seed,
+                                                self.params, self.model, wind)
+            return self.forest
+
+        forest = self.buffers.load(self.forest)
+        if self.exchange is not None and args.halo:
+            self.exchange.fill_ghosts(forest, self.buffers.padded)
+        self.forest = spread_process_fire(forest, self.elevation, self.humidity, self.temperature,
+                                          self.rank, step, self.params, max(1, args.threads),
+                                          self.buffers, self.model,
+                                          self.wind.planes(self.bounds) if self.wind is not None else None)
+        return self.forest
+
+    def apply_events(self, step):
+        """Aplicar los eventos de este paso con escrituras vectorizadas, antes de avanzar"""
+        if self.events is None:
+            return
+        rows, cols, values, changes = self.events.due(step)
+        for change in changes:
+            self.params.update(change)
+            logger.info(f"Paso {step}: parámetros cambiados {change}", extra={'step': step})
+            if self.wind is not None and self.wind.is_field(step) and (
+                    'wind_direction' in change or 'wind_speed' in change):
+                message = f"Paso {step}: el campo de --wind reemplaza el cambio de viento de --events {change}"
+                logger.warning(message)
+                if self.rank == 0:
+                    print(f"[Rank 0] {message}")
+        # Las copias fantasma del bloque temporal en los vecinos no ven el evento: todos
+        # rehacen el halo desde las regiones ya modificadas
+        if step in self.events.cell_steps and self.exchange is not None and self.exchange.block_state is not None:
+            self.exchange.block_substep = self.exchange.depth
+        if not len(rows):
+            return
+
+        from .events import resolve_ignitions
+        fire_state = FIRE_BASE + self.rank
+        if self.region is not None:
+            r0, _, c0, _ = self.bounds
+            rows, cols = rows + r0, cols + c0
+            keep, values = resolve_ignitions(self.model, self.region.read_cells(rows, cols), values, fire_state)
+            self.region.write_cells(rows[keep], cols[keep], values[keep])
+        else:
+            keep, values = resolve_ignitions(self.model, self.forest[rows, cols], values, fire_state)
+            rows, cols, values = rows[keep], cols[keep], values[keep]
+            self.forest[rows, cols] = values
+        logger.info(f"Paso {step}: {len(rows)} celdas modificadas por eventos", extra={'step': step})
+
+    def active_fires(self):
+        """Número de celdas en llamas de la región local"""
+        if self.region is not None:
+            return self.region.active_fires()
+        return int(np.count_nonzero(self.model.is_fire(self.forest)))
+
+    def frame_due(self, step):
+        """Si en este paso el rank 0 necesita las regiones de todos (GUI, destinos de frames o checkpoint)
+
+        Se decide solo con los argumentos, así que todos los procesos llegan a la misma respuesta.
+        """
+        args = self.args
+        if not args.headless or (args.watchdog and args.abort_stragglers):
+            return True
+        cadences = [(args.record, args.record_every), (args.export_frames, args.export_every),
+                    (args.stream, args.stream_every)]
+        return any(enabled and step % max(1, every) == 0 for enabled, every in cadences)
+
+    def gather(self):
+        """Recolectar las regiones de todos los procesos en el rank 0"""
+        forest = self.region.to_dense() if self.region is not None else self.forest
+        start = time.perf_counter()
+        if self.exchange is not None:
+            regions = self.exchange.gather(forest)
+        else:
+            regions = self.comm.gather({
+                'forest': forest,
+                'bounds': self.bounds
+            }, root=0)
+        if self.metrics is not None:
+            self.metrics.wait_time += time.perf_counter() - start
+            if self.exchange is None:
+                self.metrics.bytes_sent += forest.nbytes
+        if self.watchdog is not None and regions:
+            # La región propia es el búfer que se reescribe en el paso siguiente
+            self.watchdog.note_regions(self.step, [dict(region, forest=region['forest'].copy())
+                                                   if region['bounds'] == self.bounds else region
+                                                   for region in regions])
+        return regions
+
+    def publish_frame(self, step, regions):
+        """Rank 0: armar el frame global y pasarlo a los destinos que toque en este paso"""
+        sinks = [sink for every, sink in self.frame_sinks if step % every == 0]
+        if not regions or not sinks:
+            return None
+        if self.frame is None:
+            self.frame = np.zeros((ROWS, COLS), dtype=regions[0]['forest'].dtype)
+        for region in regions:
+            r0, r1, c0, c1 = region['bounds']
+            self.frame[r0:r1, c0:c1] = region['forest']
+        for sink in sinks:
+            sink.write(step, self.frame)
+        return self.frame
+
+    def close(self):
+        """Detener el watchdog y cerrar los destinos de frames"""
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        for _, sink in self.frame_sinks:
+            sink.close()
+
+    def report_metrics(self, step):
+        """Cada --metrics-every pasos, reunir las métricas de todos los procesos en el rank 0"""
+        if self.metrics is None or (step + 1) % max(1, self.args.metrics_every):
+            return None
+        if self.exchange is not None:
+            self.metrics.bytes_sent += self.exchange.bytes_sent
+            self.exchange.bytes_sent = 0
+        from .metrics import state_counts
+        counts = self.region.state_counts() if self.region is not None else state_counts(self.forest, self.model)
+        all_stats = self.comm.gather(self.metrics.snapshot(self.rank, counts), root=0)
+        if self.rank != 0:
+            return None
+        return self.metrics_writer.write(step, all_stats)
+
+
+def simulation_worker_loop(sim):
+    """Bucle de simulación para worker - SIN GUI"""
+    rank = sim.rank
+    step = 0
+
+    print(f"[Rank {rank}] Worker iniciando bucle de simulación...")
+
+    while True:
+        try:
+            continue_simulation = sim.comm.bcast(None, root=0)
+            if not continue_simulation:
+                print(f"[Rank {rank}] Recibida señal de fin de simulación")
+                break
+
+            sim.advance(step)
+
+            fire_count = sim.active_fires()
+            if step % 10 == 0:
+                print(f"[Rank {rank}] Paso {step}: {fire_count} fuegos activos")
+
+            if sim.frame_due(step):
+                sim.gather()
+            sim.report_metrics(step)
+
+            step += 1
+
+        except Exception as e:
+            logger.error(f"Error en worker {rank}: {e}")
+            print(f"[Rank {rank}] Error en worker: {e}")
+            break
+
+    print(f"[Rank {rank}] Worker terminado")
+
+
+def run_master(sim):
+    """Coordinador: información del cluster y GUI"""
+    print(f"SIMULACIÓN DE INCENDIOS FORESTALES - COORDINADOR")
+    print(f"   Ejecutándose en: {sim.hostname}")
+    print(f"   Total de procesos: {sim.size}")
+
+    print("\nINFORMACIÓN DE PROCESOS REMOTOS CONECTADOS:")
+    print("=" * 60)
+    for info in sim.process_info:
+        if info['rank'] != 0:
+            print(f"  Worker {info['rank']}: {info['hostname']} ({info['ip']})")
+            print(f"    OS: {info['os']}")
+            print(f"    CPU: {info['cpu_cores']} cores | RAM: {info['memory_gb']} GB")
+            print("-" * 40)
+
+    # Tk solo se carga en el coordinador
+    import tkinter as tk
+    from .gui import MasterFireApp
+
+    root = tk.Tk()
+    app = MasterFireApp(root, sim, sim.process_info)
+
+    print(f"[Rank {sim.rank}] Iniciando GUI Master...")
+    root.mainloop()
+
+
+def run_headless_master(sim):
+    """Coordinador sin GUI: avanza --steps pasos y solo informa por consola y métricas"""
+    rank = sim.rank
+    print(f"[Rank {rank}] Coordinador sin GUI: {sim.args.steps} pasos")
+    start = time.time()
+    for step in range(sim.args.steps):
+        sim.comm.bcast(True, root=0)
+        sim.advance(step)
+        if sim.frame_due(step):
+            sim.publish_frame(step, sim.gather())
+        record = sim.report_metrics(step)
+        if record is not None:
+            print(f"[Rank {rank}] Paso {step}: {record['fires']} fuegos | {record['burned']} quemados | "
+                  f"{record['steps_per_s']} pasos/s")
+    sim.comm.bcast(False, root=0)
+    print(f"[Rank {rank}] Simulación completada en {time.time() - start:.2f}s")
+
+
+def run_worker(sim):
+    """Proceso trabajador sin GUI"""
+    rank = sim.rank
+    print(f"[Rank {rank}] Iniciando como proceso worker...")
+
+    print(f"[Rank {rank}] Verificando fuegos iniciales...")
+    initial_fires = sim.active_fires()
+    print(f"[Rank {rank}] Fuegos iniciales: {initial_fires}")
+
+    if initial_fires == 0:
+        print(f"[Rank {rank}] Creando fuegos iniciales...")
+        if sim.region is not None:
+            sim.region.initialize_fires(sim.model.initial_fire_states)
+        else:
+            sim.forest = initialize_process_fires(sim.forest, rank, sim.model.initial_fire_states)
+        new_fires = sim.active_fires()
+        print(f"[Rank {rank}] Fuegos creados: {new_fires}")
+
+    simulation_worker_loop(sim)
+
+
+def run(argv=None):
+    """Punto de entrada: iniciar MPI y ejecutar el modo pedido en la línea de comandos"""
+    startup_t0 = time.time()
+    args = parse_arguments(argv)
+
+    from mpi4py import MPI
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+    startup_times = {'mpi_init': time.time() - startup_t0}
+
+    hostname = socket.gethostname()
+    log_listener = configure_logging(rank, hostname, args.log_sample)
+    print(f"[Rank {rank}] Proceso iniciado en {hostname}")
+
+    if args.sweep:
+        from .sweep import build_sweep_tasks, run_sweep
+        run_sweep(comm, build_sweep_tasks(args), args.seed, args.steps, args.results, args.threads,
+                  args.terrain, open_terrain_cache(args))
+    elif args.ensemble > 0:
+        from .ensemble import run_ensemble
+        print(f"[Rank {rank}] Modo ensemble: {args.ensemble} realizaciones")
+        run_ensemble(comm, args.ensemble, args.group_size, args.seed, args.steps, args.output,
+                     args.threads, args.terrain, open_terrain_cache(args))
+    elif args.arrival:
+        from .arrival import run_arrival
+        sim = Simulation(comm, args, startup_t0, startup_times)
+        try:
+            run_arrival(sim, args.raster)
+        finally:
+            sim.close()
+    else:
+        sim = Simulation(comm, args, startup_t0, startup_times)
+        if rank == 0 and args.headless:
+            run_headless_master(sim)
+        elif rank == 0:
+            run_master(sim)
+        else:
+            run_worker(sim)
+        sim.close()
+
+    if args.merge_logs:
+        merge_logs(comm, log_listener, rank, hostname, args.merge_logs)
+    else:
+        stop_logging(log_listener)
+    print(f"[Rank {rank}] Proceso terminado")
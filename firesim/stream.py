@@ -0,0 +1,222 @@
+import argparse
+import logging
+import os
+import socket
+import struct
+import threading
+import zlib
+
+import numpy as np
+
+from .config import FIRE_LOW, FIRE_HIGH, FIRE_BASE
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'FSIM'
+VERSION = 1
+# Saludo al conectar: magia, versión, filas, columnas y número de procesos
+HELLO = struct.Struct('>4sBIII')
+# Cabecera de cada frame: tipo, paso y largo de los datos comprimidos
+FRAME = struct.Struct('>BII')
+FULL, DELTA = 0, 1
+FRAME_DTYPE = np.int16
+# Segundos para que cada visor reciba el último frame al cerrar
+CLOSE_TIMEOUT = 1.0
+
+
+def parse_address(address):
+    """``tcp:host:puerto`` o ``unix:/ruta``; un número solo es un puerto TCP local"""
+    kind, _, rest = address.partition(':')
+    if kind == 'unix':
+        return socket.AF_UNIX, rest
+    if kind == 'tcp':
+        host, _, port = rest.rpartition(':')
+        return socket.AF_INET, (host or '127.0.0.1', int(port))
+    return socket.AF_INET, ('127.0.0.1', int(address))
+
+
+def encode_frame(frame, base):
+    """Frame completo comprimido, o solo las celdas que cambiaron respecto a ``base``"""
+    if base is None:
+        return FULL, zlib.compress(frame.tobytes(), 1)
+    changed = np.flatnonzero(frame != base).astype(np.uint32)
+    payload = changed.tobytes() + frame.ravel()[changed].tobytes()
+    return DELTA, zlib.compress(payload, 1)
+
+
+def decode_frame(kind, payload, base, shape):
+    data = zlib.decompress(payload)
+    if kind == FULL:
+        return np.frombuffer(data, dtype=FRAME_DTYPE).reshape(shape).copy()
+    count = len(data) // 6
+    changed = np.frombuffer(data[:count * 4], dtype=np.uint32)
+    frame = base.copy()
+    frame.ravel()[changed] = np.frombuffer(data[count * 4:], dtype=FRAME_DTYPE)
+    return frame
+
+
+class FrameStreamer:
+    """Publicar los frames del rank 0 por un socket local para visores externos
+
+    ``write`` solo guarda el último frame y avisa; cada visor tiene su propio hilo que
+    envía el frame más reciente (completo la primera vez, después solo las diferencias
+    con el último que recibió). Un visor lento se salta frames y nunca frena la simulación.
+    """
+
+    def __init__(self, address, shape, num_processes):
+        self.family, self.address = parse_address(address)
+        self.hello = HELLO.pack(MAGIC, VERSION, shape[0], shape[1], num_processes)
+        self.latest = None
+        self.step = -1
+        self.closed = False
+        self.clients = []
+        self.condition = threading.Condition()
+
+        if self.family == socket.AF_UNIX and os.path.exists(self.address):
+            os.unlink(self.address)
+        self.server = socket.socket(self.family, socket.SOCK_STREAM)
+        if self.family == socket.AF_INET:
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(self.address)
+        self.server.listen()
+        threading.Thread(target=self._accept, name='stream-accept', daemon=True).start()
+        print(f"[Rank 0] Transmitiendo frames en {address}")
+
+    def write(self, step, frame):
+        # Copia nueva en cada paso: los hilos de los visores pueden seguir leyendo la anterior
+        frame = np.array(frame, dtype=FRAME_DTYPE)
+        with self.condition:
+            self.latest = frame
+            self.step = step
+            self.condition.notify_all()
+
+    def _accept(self):
+        while not self.closed:
+            try:
+                connection, _ = self.server.accept()
+            except OSError:
+                break
+            client = threading.Thread(target=self._serve, args=(connection,), name='stream-client', daemon=True)
+            client.start()
+            # Los hilos de visores ya desconectados se descartan para no acumularlos
+            self.clients = [c for c in self.clients if c.is_alive()] + [client]
+
+    def _serve(self, connection):
+        base, sent_step = None, -1
+        logger.info("Visor conectado")
+        try:
+            connection.sendall(self.hello)
+            while True:
+                with self.condition:
+                    self.condition.wait_for(lambda: self.closed or self.step != sent_step)
+                    # Al cerrar todavía se envía el último frame pendiente
+                    if self.step == sent_step:
+                        break
+                    frame, step = self.latest, self.step
+                kind, payload = encode_frame(frame, base)
+                connection.sendall(FRAME.pack(kind, step, len(payload)) + payload)
+                base, sent_step = frame, step
+        except OSError:
+            pass
+        finally:
+            connection.close()
+            logger.info("Visor desconectado")
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.server.close()
+        for client in self.clients:
+            if client.is_alive():
+                client.join(timeout=CLOSE_TIMEOUT)
+        if self.family == socket.AF_UNIX and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+def receive_exactly(connection, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("El emisor cerró la conexión")
+        data += chunk
+    return bytes(data)
+
+
+def read_frames(address):
+    """Conectarse a un FrameStreamer y generar (paso, frame, número de procesos)"""
+    family, target = parse_address(address)
+    with socket.socket(family, socket.SOCK_STREAM) as connection:
+        connection.connect(target)
+        magic, version, rows, cols, num_processes = HELLO.unpack(receive_exactly(connection, HELLO.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Protocolo desconocido en {address}")
+        frame = None
+        while True:
+            try:
+                kind, step, length = FRAME.unpack(receive_exactly(connection, FRAME.size))
+                payload = receive_exactly(connection, length)
+            except ConnectionError:
+                return
+            frame = decode_frame(kind, payload, frame, (rows, cols))
+            yield step, frame, num_processes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Visor de frames transmitidos con --stream")
+    parser.add_argument('address', help="Dirección de --stream (tcp:host:puerto, unix:/ruta o puerto)")
+    parser.add_argument('--no-gui', action='store_true', help="Solo mostrar el paso y los fuegos por consola")
+    args = parser.parse_args(argv)
+
+    frames = read_frames(args.address)
+    if args.no_gui:
+        for step, frame, _ in frames:
+            fires = np.count_nonzero(((frame >= FIRE_LOW) & (frame <= FIRE_HIGH)) | (frame >= FIRE_BASE))
+            print(f"Paso {step}: {fires} fuegos")
+        return
+
+    import queue
+    import tkinter as tk
+    from .colors import state_rgb_lut, frame_rgb, encode_ppm
+    from .config import CELL_SIZE
+
+    # La red se lee en otro hilo; la ventana solo toma el último frame recibido
+    latest = queue.Queue(maxsize=1)
+
+    def receive():
+        for item in frames:
+            if latest.full():
+                try:
+                    latest.get_nowait()
+                except queue.Empty:
+                    pass
+            latest.put(item)
+
+    threading.Thread(target=receive, daemon=True).start()
+    root = tk.Tk()
+    root.title(f"Transmisión - {args.address}")
+    label = tk.Label(root, text="Esperando frames...")
+    label.pack()
+    image_label = tk.Label(root)
+    image_label.pack()
+    luts = {}
+
+    def refresh():
+        try:
+            step, frame, num_processes = latest.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            lut = luts.setdefault(num_processes, state_rgb_lut(num_processes))
+            image_label.image = tk.PhotoImage(data=encode_ppm(frame_rgb(frame, lut, CELL_SIZE)), format='PPM')
+            image_label.config(image=image_label.image)
+            label.config(text=f"Paso: {step}")
+        root.after(30, refresh)
+
+    refresh()
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import itertools
+import json
+import logging
+import os
+import socket
+import time
+
+import numpy as np
+from mpi4py import MPI
+
+from .config import ROWS, COLS, FIRE_BASE
+from .kernels import StateBuffers, spread_process_fire, affected_cells
+from .terrain import generate_terrain, initialize_process_fires, seed_realization
+
+logger = logging.getLogger(__name__)
+
+SWEEP_TAG_READY = 1
+SWEEP_TAG_TASK = 2
+
+
+def build_sweep_tasks(args):
+    """Combinar los valores del barrido en una lista de puntos de parámetros"""
+    def values(text, cast):
+        return [cast(v.strip()) for v in text.split(',') if v.strip()]
+
+    grid = itertools.product(
+        values(args.wind_directions, str),
+        values(args.wind_speeds, float),
+        values(args.prob_bases, float),
+        values(args.humidity_bases, float),
+        values(args.elevation_factors, float),
+    )
+    keys = ['wind_direction', 'wind_speed', 'prob_base', 'humidity_base', 'elevation_factor']
+    return [dict(zip(keys, combination)) for combination in grid]
+
+
+def sweep_key(params):
+    """Clave estable de un punto del barrido"""
+    return json.dumps(params, sort_keys=True)
+
+
+def load_completed_sweep(path):
+    """Leer los puntos ya terminados de un barrido interrumpido"""
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path) as f:
+        for line in f:
+            try:
+                completed.add(sweep_key(json.loads(line)['params']))
+            except (ValueError, KeyError):
+                # Línea truncada por una interrupción: el punto se repite
+                continue
+    return completed
+
+
+def run_sweep_task(params, seed, steps, threads=1, terrain='ruido', cache=None):
+    """Simular un punto del barrido sobre la malla completa"""
+    start = time.time()
+    np.random.seed(seed)
+    forest, elevation, humidity, temperature = generate_terrain(terrain, seed, 0, ROWS, 0, COLS, cache)
+    # Mismos focos y números aleatorios en todos los puntos: solo cambian los parámetros
+    seed_realization(seed, 0, 0)
+    forest = initialize_process_fires(forest, 0)
+    buffers = StateBuffers(forest, elevation, humidity, temperature, threads)
+
+    steps_run = 0
+    for step in range(steps):
+        forest = spread_process_fire(forest, elevation, humidity, temperature, 0, step, params, threads,
+                                     buffers)
+        steps_run += 1
+        if not np.any(forest == FIRE_BASE):
+            break
+
+    return {
+        'params': params,
+        'burned_cells': int(np.count_nonzero(affected_cells(forest))),
+        'active_fires': int(np.count_nonzero(forest == FIRE_BASE)),
+        'steps': steps_run,
+        'elapsed': round(time.time() - start, 3),
+        'hostname': socket.gethostname(),
+    }
+
+
+def run_sweep(comm, tasks, seed, steps, results_path, threads=1, terrain='ruido', cache=None):
+    """Barrido maestro/trabajador: el rank 0 reparte tareas bajo demanda"""
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+
+    def run_task(params):
+        try:
+            result = run_sweep_task(params, seed, steps, threads, terrain, cache)
+        except Exception as e:
+            # El coordinador espera una respuesta por cada tarea: el error también se devuelve
+            logger.error(f"Error en el punto {sweep_key(params)}: {e}")
+            result = {'params': params, 'error': f"{type(e).__name__}: {e}"}
+        result['rank'] = rank
+        return result
+
+    if rank != 0:
+        result = None
+        while True:
+            comm.send(result, dest=0, tag=SWEEP_TAG_READY)
+            params = comm.recv(source=0, tag=SWEEP_TAG_TASK)
+            if params is None:
+                break
+            result = run_task(params)
+        return
+
+    completed = load_completed_sweep(results_path)
+    pending = [params for params in tasks if sweep_key(params) not in completed]
+    print(f"BARRIDO DE PARÁMETROS: {len(tasks)} puntos, {len(tasks) - len(pending)} ya completados")
+    pending.reverse()
+    failed = []
+
+    with open(results_path, 'a') as results:
+        def record(result):
+            if 'error' in result:
+                # No se guarda: al reanudar el barrido el punto se vuelve a intentar
+                failed.append(result)
+                print(f"[Rank 0] Punto fallido en rank {result['rank']}: {result['error']}")
+                return
+            results.write(json.dumps(result) + "\n")
+            results.flush()
+            print(f"[Rank 0] Punto completado por rank {result['rank']}: "
+                  f"{result['burned_cells']} celdas en {result['steps']} pasos")
+
+        active_workers = size - 1
+        status = MPI.Status()
+        while active_workers > 0:
+            result = comm.recv(source=MPI.ANY_SOURCE, tag=SWEEP_TAG_READY, status=status)
+            if result is not None:
+                record(result)
+            task = pending.pop() if pending else None
+            if task is None:
+                active_workers -= 1
+            comm.send(task, dest=status.Get_source(), tag=SWEEP_TAG_TASK)
+
+        # Sin trabajadores el coordinador ejecuta el barrido él mismo
+        while pending:
+            record(run_task(pending.pop()))
+
+    print(f"BARRIDO COMPLETADO: resultados en {results_path}")
+    if failed:
+        print(f"   {len(failed)} puntos fallidos; se repiten al volver a ejecutar el barrido")
+    logger.info(f"Barrido completado: {len(tasks)} puntos")
@@ -0,0 +1,210 @@
+import logging
+import random
+from functools import lru_cache
+
+import numpy as np
+
+from .config import EMPTY, TREE_YOUNG, TREE_MATURE, TREE_OLD, WATER, FIRE_BASE
+from .kernels import cell_uniforms
+
+logger = logging.getLogger(__name__)
+
+
+def generate_region_terrain(row_start, row_end, col_start, col_end):
+    """Generar terreno para una región específica"""
+    rows = row_end - row_start
+    cols = col_end - col_start
+    
+    logger.info(f"Generando terreno región: {rows}x{cols} celdas")
+    
+    
+    terrain = np.random.choice([TREE_YOUNG, TREE_MATURE, TREE_OLD, EMPTY, WATER], 
+                              size=(rows, cols),
+                              p=[0.3, 0.4, 0.2, 0.08, 0.02])
+    
+    
+    elevation = np.random.random((rows, cols)) * 100
+    
+    
+    humidity = np.random.uniform(0.3, 0.9, (rows, cols))
+    
+    
+    temperature = np.random.uniform(20, 35, (rows, cols))
+    
+    logger.info("Terreno de región generado exitosamente")
+    return terrain, elevation, humidity, temperature
+
+
+# Parámetros del terreno por ruido: escala en celdas de la octava más gruesa, octavas por
+# campo y fracción de la malla que ocupa cada tipo de celda
+TERRAIN_PARAMS = {
+    'scale': 48,
+    'persistence': 0.5,
+    'octaves': {'elevation': 4, 'humidity': 2, 'temperature': 2, 'vegetation': 3},
+    'water_fraction': 0.02,
+    # Tierra, árbol joven y árbol maduro; el resto es árbol viejo
+    'vegetation_fractions': (0.08, 0.3, 0.4),
+}
+
+FIELD_IDS = {'elevation': 0, 'humidity': 1, 'temperature': 2, 'vegetation': 3}
+VEGETATION_STATES = np.array([EMPTY, TREE_YOUNG, TREE_MATURE, TREE_OLD])
+
+
+def add_value_noise(total, scratch, seed, field, octave, rows, cols, scale, amplitude):
+    """Sumar a total una octava de ruido de valor suavizado en coordenadas globales"""
+    axes = []
+    for coords in (rows, cols):
+        position = coords / scale
+        base = np.floor(position)
+        frac = position - base
+        axes.append((base.astype(np.int64), (frac * frac * (3 - 2 * frac)).astype(np.float32)))
+    (row_base, row_weight), (col_base, col_weight) = axes
+    r0, c0 = row_base[0], col_base[0]
+    lattice = cell_uniforms(seed * len(FIELD_IDS) + field, octave, np.arange(r0, row_base[-1] + 2),
+                            np.arange(c0, col_base[-1] + 2)).astype(np.float32)
+    lattice *= amplitude
+
+    # Interpolación separable: columnas sobre la retícula pequeña, luego copia de filas
+    j = col_base - c0
+    by_cols = lattice[:, j] + (lattice[:, j + 1] - lattice[:, j]) * col_weight
+    i = row_base - r0
+    np.take(by_cols, i, axis=0, out=scratch)
+    total += scratch
+    np.take(np.diff(by_cols, axis=0), i, axis=0, out=scratch)
+    scratch *= row_weight[:, None]
+    total += scratch
+
+
+def fractal_noise(seed, name, rows, cols, params, scratch=None):
+    """Suma de octavas de ruido de valor, normalizada a [0, 1)"""
+    shape = (len(rows), len(cols))
+    if scratch is None:
+        scratch = np.empty(shape, dtype=np.float32)
+    total = np.zeros(shape, dtype=np.float32)
+    octaves = params['octaves'][name]
+    amplitudes = [params['persistence'] ** octave for octave in range(octaves)]
+    for octave, amplitude in enumerate(amplitudes):
+        add_value_noise(total, scratch, seed, FIELD_IDS[name], octave, rows, cols,
+                        params['scale'] / 2 ** octave, amplitude / sum(amplitudes))
+    return total
+
+
+@lru_cache(maxsize=None)
+def _noise_levels(seed, name, scale, persistence, octaves, fractions):
+    coords = np.arange(1024)
+    sample = fractal_noise(seed, name, coords, coords,
+                           {'scale': scale, 'persistence': persistence, 'octaves': {name: octaves}})
+    return tuple(np.quantile(sample, np.cumsum(fractions)))
+
+
+def noise_levels(seed, name, params, fractions):
+    """Umbrales que dejan por debajo cada fracción acumulada, medidos en una muestra fija
+
+    La muestra no depende de la región, así que todos los procesos usan los mismos umbrales.
+    """
+    return _noise_levels(seed, name, params['scale'], params['persistence'], params['octaves'][name],
+                         tuple(fractions))
+
+
+def generate_noise_terrain(seed, row_start, row_end, col_start, col_end, halo=0, params=None):
+    """Terreno correlacionado espacialmente a partir de coordenadas globales
+
+    Cada proceso genera su región (más ``halo`` celdas por lado) sin comunicarse: los
+    bordes coinciden con los de los vecinos. Los campos continuos son float32.
+    """
+    if params is None:
+        params = TERRAIN_PARAMS
+    rows = np.arange(row_start - halo, row_end + halo)
+    cols = np.arange(col_start - halo, col_end + halo)
+    logger.info(f"Generando terreno por ruido: {len(rows)}x{len(cols)} celdas")
+
+    scratch = np.empty((len(rows), len(cols)), dtype=np.float32)
+    elevation = fractal_noise(seed, 'elevation', rows, cols, params, scratch)
+    water_level, = noise_levels(seed, 'elevation', params, [params['water_fraction']])
+    water = elevation < water_level
+    # Zonas bajas más húmedas y templadas
+    lowland = 1 - elevation
+
+    humidity = fractal_noise(seed, 'humidity', rows, cols, params, scratch)
+    humidity += lowland
+    humidity *= 0.3
+    humidity += 0.3
+    temperature = fractal_noise(seed, 'temperature', rows, cols, params, scratch)
+    temperature += lowland
+    temperature *= 7.5
+    temperature += 20
+    elevation *= 100
+
+    vegetation = fractal_noise(seed, 'vegetation', rows, cols, params, scratch)
+    levels = noise_levels(seed, 'vegetation', params, params['vegetation_fractions'])
+    terrain = VEGETATION_STATES[np.searchsorted(levels, vegetation)]
+    terrain[water] = WATER
+    return terrain, elevation, humidity, temperature
+
+
+def generate_terrain(kind, seed, row_start, row_end, col_start, col_end, cache=None):
+    """Terreno de la región según el generador elegido ('ruido' o 'aleatorio')
+
+    Con ``cache`` el terreno por ruido se lee de disco si ya se generó; el bosque se
+    copia porque la simulación lo modifica, los campos fijos quedan en memmap.
+    """
+    if kind == 'aleatorio':
+        return generate_region_terrain(row_start, row_end, col_start, col_end)
+    if cache is None:
+        return generate_noise_terrain(seed, row_start, row_end, col_start, col_end)
+
+    bounds = (row_start, row_end, col_start, col_end)
+    key = cache.key(seed, TERRAIN_PARAMS)
+    fields = cache.load(key, bounds)
+    if fields is None:
+        fields = generate_noise_terrain(seed, row_start, row_end, col_start, col_end)
+        cache.store(key, bounds, fields)
+    forest, elevation, humidity, temperature = fields
+    return np.array(forest), elevation, humidity, temperature
+
+
+def initialize_process_fires(forest, process_rank, fire_states=None):
+    """Inicializar fuegos específicos para cada proceso"""
+    num_fires = random.randint(2, 5)  
+    fires_created = 0
+    fire_state = FIRE_BASE + process_rank  
+    
+    for _ in range(num_fires):
+        i = random.randint(0, forest.shape[0] - 1)
+        j = random.randint(0, forest.shape[1] - 1)
+        if forest[i, j] in [TREE_YOUNG, TREE_MATURE, TREE_OLD]:
+            # Modelos con varias intensidades eligen una al azar
+            forest[i, j] = random.choice(fire_states) if fire_states else fire_state
+            fires_created += 1
+    
+    logger.info(f"Inicializados {fires_created} focos de incendio para proceso {process_rank}")
+    return forest
+
+
+def initialize_region_fires(forest, bounds, process_rank, total_rows, total_cols, fire_states=None):
+    """Focos elegidos sobre la malla global; cada proceso enciende los que caen en su región
+
+    Todos los procesos deben sembrar ``random`` igual para elegir los mismos focos, así
+    el número y la posición de los focos no dependen de la descomposición.
+    """
+    r0, r1, c0, c1 = bounds
+    num_fires = random.randint(2, 5)
+    fires_created = 0
+    for _ in range(num_fires):
+        i = random.randint(0, total_rows - 1)
+        j = random.randint(0, total_cols - 1)
+        # Se sortea en todos los procesos para que sigan con la misma secuencia
+        state = random.choice(fire_states) if fire_states else FIRE_BASE + process_rank
+        if r0 <= i < r1 and c0 <= j < c1 and forest[i - r0, j - c0] in [TREE_YOUNG, TREE_MATURE, TREE_OLD]:
+            forest[i - r0, j - c0] = state
+            fires_created += 1
+
+    logger.info(f"Inicializados {fires_created} focos de incendio para proceso {process_rank}")
+    return forest
+
+
+def seed_realization(seed, realization, process_rank):
+    """Sembrar los generadores aleatorios de una realización"""
+    state = np.random.SeedSequence([seed, realization, process_rank]).generate_state(2)
+    random.seed(int(state[0]))
+    np.random.seed(int(state[1]))
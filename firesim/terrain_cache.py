@@ -0,0 +1,94 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Cambiar al modificar el generador: invalida las entradas anteriores
+CACHE_VERSION = 1
+FIELDS = ('forest', 'elevation', 'humidity', 'temperature')
+
+
+class TerrainCache:
+    """Terrenos generados guardados en disco como .npy que se abren con memmap
+
+    Cada entrada es un directorio ``{clave}_{r0}_{r1}_{c0}_{c1}``; una región se sirve
+    de cualquier entrada de la misma clave que la contenga. Las entradas usadas
+    menos recientemente se borran cuando el total supera ``max_bytes``.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(seed, params):
+        """Hash de la semilla y los parámetros de generación"""
+        text = json.dumps({'version': CACHE_VERSION, 'seed': seed, 'params': params}, sort_keys=True)
+        return hashlib.sha256(text.encode()).hexdigest()[:24]
+
+    def _entries(self, key='*'):
+        for path in glob.glob(os.path.join(self.directory, f"{key}_*")):
+            name = os.path.basename(path)
+            if name.startswith('.'):
+                continue
+            parts = name.split('_')
+            yield path, parts[0], tuple(int(v) for v in parts[1:5])
+
+    def load(self, key, bounds):
+        """Campos de la región (memmap de solo lectura) o None si no hay entrada que la cubra"""
+        r0, r1, c0, c1 = bounds
+        for path, _, box in self._entries(key):
+            if box[0] <= r0 and r1 <= box[1] and box[2] <= c0 and c1 <= box[3]:
+                local = (slice(r0 - box[0], r1 - box[0]), slice(c0 - box[2], c1 - box[2]))
+                try:
+                    fields = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')[local]
+                              for name in FIELDS]
+                    os.utime(path)
+                except OSError:
+                    # Otra ejecución la está desalojando
+                    continue
+                logger.info(f"Terreno leído de la caché: {os.path.basename(path)}")
+                return fields
+        return None
+
+    def store(self, key, bounds, fields):
+        """Guardar una región; si otro proceso la escribió antes se conserva la suya"""
+        name = f"{key}_{'_'.join(str(v) for v in bounds)}"
+        final = os.path.join(self.directory, name)
+        staging = tempfile.mkdtemp(prefix=f".{name}.", dir=self.directory)
+        for field_name, field in zip(FIELDS, fields):
+            np.save(os.path.join(staging, f"{field_name}.npy"), field)
+        try:
+            os.rename(staging, final)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict(keep=final)
+
+    def size(self, path):
+        return sum(os.path.getsize(f) for f in glob.glob(os.path.join(path, '*.npy')))
+
+    def evict(self, keep=None):
+        """Borrar las entradas menos usadas hasta quedar por debajo de max_bytes"""
+        entries = []
+        for path, _, _ in self._entries():
+            try:
+                entries.append((os.path.getmtime(path), self.size(path), path))
+            except OSError:
+                continue
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            logger.info(f"Terreno desalojado de la caché: {os.path.basename(path)}")
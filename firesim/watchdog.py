@@ -0,0 +1,171 @@
+import logging
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from mpi4py import MPI
+
+from .config import ROWS, COLS
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_TAG = 77
+POLL_INTERVAL = 0.2
+# Diferencia mínima con la mediana para que el ruido de pasos muy cortos no cuente
+MIN_EXCESS_SECONDS = 0.01
+
+
+class Watchdog:
+    """Latidos de cada proceso hacia el rank 0 para detectar procesos rezagados o colgados
+
+    Los workers envían ``(paso, duración)`` con isend sin esperar respuesta; la duración
+    es el cálculo del paso sin la espera de comunicaciones. Como los pasos van sincronizados,
+    un proceso es rezagado si el promedio de sus últimos ``window`` pasos es ``factor`` veces
+    la mediana de los demás, o si está atrasado y lleva ``max_seconds`` sin latir (una pausa
+    de la GUI no cuenta: nadie avanza). Con ``abort`` se guarda el último estado global
+    reunido y se aborta el trabajo en vez de quedar colgado.
+
+    Si MPI ofrece THREAD_MULTIPLE, un hilo del rank 0 recibe los latidos por un comunicador
+    propio y sigue atento aunque el hilo principal esté bloqueado en gather; si no, el
+    rank 0 los revisa en cada paso y no puede detectar un proceso colgado.
+    """
+
+    def __init__(self, comm, process_info, window=5, factor=2.0, max_seconds=30.0, abort=False,
+                 checkpoint='checkpoint.npz'):
+        self.comm = comm.Dup()
+        self.rank = comm.Get_rank()
+        self.size = comm.Get_size()
+        self.hosts = {info['rank']: info['hostname'] for info in process_info}
+        self.window = max(1, window)
+        self.factor = factor
+        self.max_seconds = max_seconds
+        self.abort = abort
+        self.checkpoint = checkpoint
+        self.pending = []
+        self.lock = threading.Lock()
+        self.regions = None
+        self.regions_step = None
+        self.thread = None
+        if self.rank == 0:
+            now = time.time()
+            self.last = {r: {'step': -1, 'times': deque(maxlen=self.window), 'seen': now}
+                         for r in range(self.size)}
+            self.flagged = set()
+            self.running = True
+            if MPI.Query_thread() == MPI.THREAD_MULTIPLE:
+                self.thread = threading.Thread(target=self._monitor, name='watchdog', daemon=True)
+                self.thread.start()
+            else:
+                message = "MPI sin THREAD_MULTIPLE: el watchdog revisa los latidos en cada paso " \
+                          "y no detecta procesos colgados"
+                logger.warning(message)
+                print(f"[Rank 0] {message}")
+
+    def beat(self, step, step_time):
+        """Informar que este proceso terminó ``step``; nunca bloquea"""
+        if self.rank == 0:
+            self._record(0, step, step_time)
+            if self.thread is None:
+                self.poll()
+            return
+        # Liberar los envíos ya completados para que la lista no crezca
+        self.pending = [request for request in self.pending if not request.Test()]
+        self.pending.append(self.comm.isend((step, step_time), dest=0, tag=HEARTBEAT_TAG))
+
+    def note_regions(self, step, regions):
+        """Rank 0: recordar las últimas regiones reunidas para el punto de control"""
+        if regions:
+            with self.lock:
+                self.regions, self.regions_step = regions, step
+
+    def _record(self, rank, step, step_time):
+        with self.lock:
+            entry = self.last[rank]
+            entry['step'] = step
+            entry['times'].append(step_time)
+            entry['seen'] = time.time()
+
+    def _receive(self):
+        status = MPI.Status()
+        while self.comm.iprobe(source=MPI.ANY_SOURCE, tag=HEARTBEAT_TAG, status=status):
+            step, step_time = self.comm.recv(source=status.Get_source(), tag=HEARTBEAT_TAG)
+            self._record(status.Get_source(), step, step_time)
+
+    def stragglers(self):
+        """Procesos lentos frente a los demás o en silencio, con el motivo"""
+        now = time.time()
+        with self.lock:
+            lead = max(entry['step'] for entry in self.last.values())
+            recent = {rank: sum(entry['times']) / len(entry['times'])
+                      for rank, entry in self.last.items() if len(entry['times']) == self.window}
+            found = {}
+            for rank, entry in self.last.items():
+                behind = lead - entry['step']
+                silent = now - entry['seen']
+                others = [value for other, value in recent.items() if other != rank]
+                if behind > 0 and silent >= self.max_seconds:
+                    found[rank] = f"{silent:.1f}s sin latido (último paso {entry['step']})"
+                elif rank in recent and others:
+                    median = float(np.median(others))
+                    if recent[rank] >= self.factor * median and recent[rank] - median >= MIN_EXCESS_SECONDS:
+                        found[rank] = f"{recent[rank]:.3f}s por paso en los últimos {self.window} pasos, " \
+                                      f"mediana de los demás {median:.3f}s"
+        return found
+
+    def poll(self):
+        """Recibir los latidos pendientes y avisar de los procesos rezagados nuevos"""
+        self._receive()
+        found = self.stragglers()
+        for rank, reason in found.items():
+            if rank not in self.flagged:
+                message = f"Proceso {rank} en {self.hosts.get(rank, '?')} rezagado: {reason}"
+                logger.warning(message)
+                print(f"[Rank 0] {message}")
+        self.flagged = set(found)
+        if found and self.abort:
+            self._abort(found)
+
+    def _monitor(self):
+        while self.running:
+            self.poll()
+            time.sleep(POLL_INTERVAL)
+
+    def save_checkpoint(self):
+        """Guardar el último estado global reunido; devuelve el paso guardado o None"""
+        with self.lock:
+            regions, step = self.regions, self.regions_step
+        if regions is None:
+            return None
+        forest = np.zeros((ROWS, COLS), dtype=regions[0]['forest'].dtype)
+        for region in regions:
+            r0, r1, c0, c1 = region['bounds']
+            forest[r0:r1, c0:c1] = region['forest']
+        np.savez(self.checkpoint, forest=forest, step=step)
+        return step
+
+    def _abort(self, found):
+        step = self.save_checkpoint()
+        if step is None:
+            print("[Rank 0] Abortando por procesos rezagados: aún no hay estado para guardar")
+        else:
+            print(f"[Rank 0] Abortando por procesos rezagados {sorted(found)}: "
+                  f"estado del paso {step} guardado en {self.checkpoint}")
+        sys.stdout.flush()
+        self.comm.Abort(1)
+
+    def stop(self):
+        """Terminar el hilo del rank 0 y vaciar los latidos pendientes"""
+        if self.rank != 0:
+            MPI.Request.Waitall(self.pending)
+            self.pending = []
+        else:
+            self.running = False
+            if self.thread is not None:
+                self.thread.join()
+        # Tras la barrera todos los latidos ya se enviaron
+        self.comm.Barrier()
+        if self.rank == 0:
+            self._receive()
+        self.comm.Free()
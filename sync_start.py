@@ -1,12 +1,40 @@
+import asyncio
 import socket
 import time
-import subprocess
 import sys
-import threading
 import os
+import re
 
-def wait_for_signal(port=12345, timeout=30):
-    """Esperar señal de sincronización con timeout"""
+HOSTFILE = 'hostfile.txt'
+READY_HOSTFILE = 'hostfile.ready.txt'
+SYNC_PORT = 12345
+# Tiempo total para que todos los workers respondan; se reintenta mientras tanto
+PROBE_TIMEOUT = 30
+PROBE_RETRY = 0.5
+LOCAL_SLOTS = 1
+OUTPUT_DIR = 'mpi_output'
+OUTPUT_CHUNK = 1 << 16
+CONSOLE_INTERVAL = 2.0
+RANK_PREFIX = re.compile(rb'^\[Rank (\d+)\]')
+
+def read_hostfile(path=HOSTFILE):
+    """Leer hosts y slots de un hostfile de Open MPI (se ignoran comentarios)"""
+    hosts = []
+    with open(path) as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            fields = line.split()
+            slots = 1
+            for field in fields[1:]:
+                if field.startswith('slots='):
+                    slots = int(field.split('=', 1)[1])
+            hosts.append((fields[0], slots))
+    return hosts
+
+def wait_for_signal(port=SYNC_PORT, timeout=30):
+    """Esperar la consulta del coordinador y responder que este host está listo"""
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     try:
@@ -16,7 +44,10 @@ def wait_for_signal(port=12345, timeout=30):
         print(f"Esperando señal en puerto {port} (timeout: {timeout}s)...")
         
         conn, addr = sock.accept()
-        print(f"Señal recibida de {addr}")  # Aquí puedes ver que se recibe la señal
+        print(f"Señal recibida de {addr}")
+        conn.settimeout(5)
+        conn.recv(64)
+        conn.sendall(f"LISTO {socket.gethostname()}\n".encode())
         conn.close()
         sock.close()
         return True
@@ -29,39 +60,128 @@ def wait_for_signal(port=12345, timeout=30):
         sock.close()
         return False
 
-def send_signal(host, port=12345, timeout=5):
-    """Enviar señal de sincronización con timeout"""
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(timeout)
+async def probe_host(host, port=SYNC_PORT, deadline=None):
+    """Consultar a un worker hasta que confirme que está listo o venza el plazo"""
+    loop = asyncio.get_running_loop()
+    if deadline is None:
+        deadline = loop.time() + PROBE_TIMEOUT
+    while loop.time() < deadline:
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port),
+                                                    timeout=max(0.1, deadline - loop.time()))
+            writer.write(b"LISTO?\n")
+            await writer.drain()
+            reply = await asyncio.wait_for(reader.readline(), timeout=max(0.1, deadline - loop.time()))
+            writer.close()
+            if reply.startswith(b"LISTO"):
+                print(f"Worker listo: {host} ({reply.decode().split()[-1]})")
+                return True
+        except (OSError, asyncio.TimeoutError):
+            pass
+        # El worker todavía no escucha: reintentar sin esperar un tiempo fijo
+        await asyncio.sleep(PROBE_RETRY)
+    print(f"No se pudo conectar a {host} (puede estar offline)")
+    return False
+
+async def probe_hosts(hosts, port=SYNC_PORT, timeout=PROBE_TIMEOUT):
+    """Consultar todos los workers a la vez; tarda lo que tarde el más lento"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    results = await asyncio.gather(*(probe_host(host, port, deadline) for host, _ in hosts))
+    return [entry for entry, ready in zip(hosts, results) if ready]
+
+def write_ready_hostfile(ready_hosts, local_slots=LOCAL_SLOTS, path=READY_HOSTFILE):
+    """Hostfile con el coordinador primero (rank 0 y la GUI) y los workers que respondieron"""
+    entries = list(ready_hosts)
+    if local_slots > 0:
+        entries.insert(0, ('localhost', local_slots))
+    with open(path, 'w') as f:
+        for host, slots in entries:
+            f.write(f"{host} slots={slots}\n")
+    return path, sum(slots for _, slots in entries)
+
+class RankOutput:
+    """Separar la salida de mpirun por prefijo ``[Rank N]`` en un archivo por proceso"""
+
+    def __init__(self, directory=OUTPUT_DIR, interval=CONSOLE_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.files = {}
+        self.lines = {}
+        self.pending = b''
+        self.start = self.last_summary = time.time()
+        os.makedirs(directory, exist_ok=True)
+
+    def _file(self, rank):
+        if rank not in self.files:
+            name = 'launcher.log' if rank is None else f'rank_{rank}.log'
+            self.files[rank] = open(os.path.join(self.directory, name), 'wb', buffering=1 << 20)
+            self.lines[rank] = 0
+        return self.files[rank]
+
+    def feed(self, chunk):
+        """Repartir un bloque leído del pipe; la última línea incompleta espera al siguiente"""
+        *lines, self.pending = (self.pending + chunk).split(b'\n')
+        for line in lines:
+            match = RANK_PREFIX.match(line)
+            rank = int(match.group(1)) if match else None
+            self._file(rank).write(line + b'\n')
+            self.lines[rank] += 1
+            # Lo que no lleva prefijo (resúmenes del rank 0, errores de mpirun) se muestra
+            if rank is None:
+                print(line.decode(errors='replace'))
+        if time.time() - self.last_summary >= self.interval:
+            self.summary()
+
+    def summary(self):
+        self.last_summary = time.time()
+        counts = ', '.join(f"rank {rank}: {count}" for rank, count in sorted(
+            (rank, count) for rank, count in self.lines.items() if rank is not None))
+        print(f"[{self.last_summary - self.start:.0f}s] Líneas por proceso: {counts or 'ninguna'}")
+
+    def close(self):
+        if self.pending:
+            self.feed(b'\n')
+        self.summary()
+        for f in self.files.values():
+            f.close()
+        print(f"Salida por proceso en {self.directory}/")
+
+async def stream_mpi_output(cmd):
+    """Leer la salida de mpirun en bloques grandes sin frenar a los procesos MPI"""
+    process = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE,
+                                                   stderr=asyncio.subprocess.STDOUT)
+    output = RankOutput()
     try:
-        print(f"Enviando señal a {host}:{port}...")
-        sock.connect((host, port))
-        sock.close()
-        print(f"Señal enviada exitosamente a {host}")
-        return True
-    except Exception as e:
-        print(f"No se pudo conectar a {host}: {e}")
-        return False
+        while True:
+            chunk = await process.stdout.read(OUTPUT_CHUNK)
+            if not chunk:
+                break
+            output.feed(chunk)
+    finally:
+        output.close()
+    return await process.wait()
 
-def run_mpi_simulation():
+def run_mpi_simulation(extra_args=None, np=1, hostfile=None):
     """Ejecutar la simulación MPI"""
+    # Opciones adicionales (p. ej. --ensemble 200) se pasan a fire_simulation.py
+    if extra_args is None:
+        extra_args = sys.argv[2:]
+    
     if os.name == 'nt':  # Windows
-        cmd = ['mpiexec', '-np', '1', 'python', 'fire_simulation.py']
+        cmd = ['mpiexec', '-np', str(np)]
+        if hostfile:
+            cmd += ['-machinefile', hostfile]
     else:  # macOS/Linux
-        cmd = ['mpirun', '-np', '1', 'python', 'fire_simulation.py']
+        cmd = ['mpirun', '-np', str(np)]
+        if hostfile:
+            cmd += ['--hostfile', hostfile]
+    cmd += ['python', 'fire_simulation.py'] + list(extra_args)
     
     print(f"Ejecutando: {' '.join(cmd)}")
     
     try:
-        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, 
-                                 universal_newlines=True, bufsize=1)
-        
-        # Mostrar salida en tiempo real
-        for line in iter(process.stdout.readline, ''):
-            print(line.rstrip())
-        
-        process.wait()
-        return process.returncode == 0
+        returncode = asyncio.run(stream_mpi_output(cmd))
+        return returncode == 0
     except Exception as e:
         print(f"Error ejecutando simulación: {e}")
         return False
@@ -71,35 +191,17 @@ def master_mode():
     print("INICIANDO COORDINACIÓN DISTRIBUIDA")
     print("   Modo: COORDINADOR (MASTER)")
     
-    # Lista de computadoras worker
-    worker_hosts = [
-        '172.20.10.4',  # Windows PC 1
-        # '192.168.1.3',  # Windows PC 2
-        # Agregar más IPs según sea necesario
-    ]
+    worker_hosts = read_hostfile()
+    print(f"Consultando {len(worker_hosts)} workers de {HOSTFILE}...")
     
-    # Dar tiempo a que los workers estén listos
-    print("Esperando 5 segundos para que los workers estén listos...")
-    time.sleep(5)
+    start = time.time()
+    ready_hosts = asyncio.run(probe_hosts(worker_hosts))
+    print(f"Resumen: {len(ready_hosts)}/{len(worker_hosts)} workers listos en {time.time() - start:.2f}s")
     
-    # Enviar señales a todas las computadoras worker
-    connected_workers = 0
-    for host in worker_hosts:
-        if send_signal(host):
-            print(f"Conectado exitosamente a {host}")
-            connected_workers += 1
-        else:
-            print(f"No se pudo conectar a {host} (puede estar offline)")
-    
-    print(f"Resumen: {connected_workers}/{len(worker_hosts)} workers conectados")
-    
-    if connected_workers > 0:
-        print("Iniciando simulación distribuida...")
-        # Esperar un poco más para asegurar sincronización
-        time.sleep(2)
-        
-        # Ejecutar simulación MPI
-        success = run_mpi_simulation()
+    if ready_hosts:
+        hostfile, processes = write_ready_hostfile(ready_hosts)
+        print(f"Iniciando simulación distribuida con {processes} procesos...")
+        success = run_mpi_simulation(np=processes, hostfile=hostfile)
         if success:
             print("Simulación completada exitosamente")
         else:
@@ -109,21 +211,12 @@ def master_mode():
         run_mpi_simulation()
 
 def worker_mode():
-    """Modo trabajador (WORKER)"""
+    """Modo trabajador (WORKER): confirmar al coordinador; sus procesos los lanza mpirun"""
     print("INICIANDO MODO WORKER")
     print("   Esperando señal del coordinador...")
     
-    # Esperar señal del coordinador
     if wait_for_signal():
-        print("Señal recibida. Iniciando simulación...")
-        # Pequeña pausa para sincronización
-        time.sleep(1)
-        # Ejecutar simulación MPI
-        success = run_mpi_simulation()
-        if success:
-            print("Simulación worker completada")
-        else:
-            print("Error en simulación worker")
+        print("Confirmación enviada. mpirun iniciará los procesos de este host.")
     else:
         print("No se recibió señal del coordinador")
 